@@ -35,7 +35,6 @@ hidden_imports = [
     'keyring.backends.macOS',
     'keyring.backends.SecretService',
     'keyring.backends.kwallet',
-    'pydantic',
     'pathlib',
     'platform',
     'subprocess',
@@ -0,0 +1,34 @@
+"""Bake resources/themes/dark.qss into src/ui/_theme_baked.py.
+
+Run with ``python -m scripts.bake_theme`` before building so the launcher
+can apply its theme without reading the stylesheet from disk at startup.
+"""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+THEME_PATH = ROOT / "resources" / "themes" / "dark.qss"
+BAKED_PATH = ROOT / "src" / "ui" / "_theme_baked.py"
+
+
+def bake(theme_path: Path = THEME_PATH, baked_path: Path = BAKED_PATH):
+    """Write the stylesheet out as a Python bytes literal."""
+    qss = theme_path.read_text(encoding="utf-8").encode("utf-8")
+
+    # A plain triple-quoted literal keeps the baked file readable; fall back
+    # to repr() for anything that would need escaping
+    if qss.isascii() and b"\\" not in qss and b'"""' not in qss and not qss.endswith(b'"'):
+        literal = 'b"""' + qss.decode("ascii") + '"""'
+    else:
+        literal = repr(qss)
+
+    baked_path.write_text(
+        '"""Dark theme stylesheet, generated by scripts/bake_theme.py. Do not edit."""\n'
+        "\n"
+        f"QSS = {literal}\n",
+        encoding="utf-8"
+    )
+
+
+if __name__ == "__main__":
+    bake()
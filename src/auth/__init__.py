@@ -1,6 +1,13 @@
 """Authentication module for Minecraft accounts."""
 
-from .microsoft import MicrosoftAuthenticator
 from .offline import OfflineAuthenticator
 
 __all__ = ["MicrosoftAuthenticator", "OfflineAuthenticator"]
+
+
+def __getattr__(name):
+    # MSAL (and cryptography under it) is only imported once Microsoft login is used
+    if name == "MicrosoftAuthenticator":
+        from .microsoft import MicrosoftAuthenticator
+        return MicrosoftAuthenticator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,159 +1,353 @@
 """Microsoft OAuth authentication for Minecraft."""
 
 import asyncio
+import base64
+import concurrent.futures
 import json
+import os
+import re
+import time
 import aiohttp
 import keyring
+import orjson
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional, Dict, Any
 import msal
 
 
+def _parse_not_after(value: str) -> datetime:
+    """Parse an Xbox ``NotAfter`` timestamp (7-digit fraction, ``Z`` suffix)."""
+    value = re.sub(r"(\.\d{6})\d+", r"\1", value.replace("Z", "+00:00"))
+    return datetime.fromisoformat(value)
+
+
+def _write_private(path: Path, data: bytes):
+    """Atomically replace path with an owner-only (0600) file; it holds tokens."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+    try:
+        # A leftover tmp file keeps its old mode despite the one passed to open()
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o600)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
+class TokenStore:
+    """Xbox Live, XSTS and Minecraft tokens persisted with their expiry."""
+    TIERS = ("xbox", "xsts", "mc")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._data: Dict[str, Dict[str, str]] = {}
+        if path.exists():
+            try:
+                self._data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                self._data = {}
+
+    def valid(self, tier: str) -> bool:
+        """Check a tier is cached and not about to expire, dropping it otherwise."""
+        entry = self._data.get(tier)
+        if entry:
+            not_after = datetime.fromisoformat(entry["not_after"])
+            if datetime.now(timezone.utc) < not_after - timedelta(seconds=60):
+                return True
+        self.invalidate(tier)
+        return False
+
+    def token(self, tier: str) -> str:
+        return self._data[tier]["token"]
+
+    def expires_in(self, tier: str) -> float:
+        """Seconds until a tier's token expires."""
+        not_after = datetime.fromisoformat(self._data[tier]["not_after"])
+        return (not_after - datetime.now(timezone.utc)).total_seconds()
+
+    def set(self, tier: str, token: str, not_after: datetime):
+        self._data[tier] = {"token": token, "not_after": not_after.isoformat()}
+
+    def invalidate(self, tier: str):
+        """Drop a tier and every tier derived from it."""
+        for name in self.TIERS[self.TIERS.index(tier):]:
+            self._data.pop(name, None)
+
+    def save(self):
+        # Bearer tokens: owner-only, and never left half-written
+        _write_private(self.path, json.dumps(self._data).encode())
+
+
 class MicrosoftAuthenticator:
     CLIENT_ID = "00000000402b5328"  # Official Minecraft Launcher client ID
     AUTHORITY = "https://login.microsoftonline.com/consumers/"
     SCOPES = ["XboxLive.signin"]
+    TOKEN_URL = "https://login.microsoftonline.com/consumers/oauth2/v2.0/token"
+    MSAL_CACHE_PATH = Path.home() / ".minecraft" / "msal_cache.bin"
+    XBL_CACHE_PATH = Path.home() / ".minecraft" / "xbl_cache.json"
 
     def __init__(self):
+        # Persist MSAL's token cache so later process starts can acquire silently
+        self._msal_cache = msal.SerializableTokenCache()
+        if self.MSAL_CACHE_PATH.exists():
+            self._msal_cache.deserialize(self.MSAL_CACHE_PATH.read_text())
+
         self.app = msal.PublicClientApplication(
             self.CLIENT_ID,
-            authority=self.AUTHORITY
+            authority=self.AUTHORITY,
+            token_cache=self._msal_cache
         )
 
-    def get_stored_refresh_token(self) -> Optional[str]:
+        # In-process cache of the last Minecraft token and profile
+        self._mc_token_cache = {"access_token": None, "expires_at": 0, "profile": None}
+        self._refresh_token: Optional[str] = None
+        self.token_store = TokenStore(self.XBL_CACHE_PATH)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Blocking MSAL and keyring calls run here instead of the loop's default executor
+        self._auth_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="msal")
+
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the auth executor."""
+        return await asyncio.get_event_loop().run_in_executor(self._auth_executor, func, *args)
+
+    async def get_stored_refresh_token(self) -> Optional[str]:
         """Retrieve stored refresh token from keyring."""
-        return keyring.get_password("minecraft_launcher", "microsoft_refresh_token")
+        self._refresh_token = await self._run_blocking(
+            keyring.get_password, "minecraft_launcher", "microsoft_refresh_token"
+        )
+        return self._refresh_token
 
-    def store_refresh_token(self, token: str):
+    async def store_refresh_token(self, token: str):
         """Store refresh token securely."""
-        keyring.set_password("minecraft_launcher", "microsoft_refresh_token", token)
+        await self._run_blocking(keyring.set_password, "minecraft_launcher", "microsoft_refresh_token", token)
+        self._refresh_token = token
+
+    def _save_msal_cache(self):
+        """Write the MSAL token cache to disk if it changed."""
+        if self._msal_cache.has_state_changed:
+            _write_private(self.MSAL_CACHE_PATH, self._msal_cache.serialize().encode())
+
+    def _cache_minecraft_token(self, access_token: str, expires_in: float, profile: Dict[str, Any]):
+        """Remember the Minecraft token and profile until the token expires."""
+        self._mc_token_cache = {
+            "access_token": access_token,
+            "expires_at": time.monotonic() + expires_in,
+            "profile": profile
+        }
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the session shared by every step of the auth chain."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300, keepalive_timeout=75)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session and the auth executor."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+        self._auth_executor.shutdown(wait=False)
 
     async def initiate_device_code_flow(self) -> Dict[str, Any]:
         """Start device code OAuth flow using MSAL."""
         def _initiate():
             return self.app.initiate_device_flow(self.SCOPES)
 
-        flow = await asyncio.get_event_loop().run_in_executor(None, _initiate)
+        flow = await self._run_blocking(_initiate)
         if "error" in flow:
             raise Exception(f"Device flow error: {flow['error_description']}")
         return flow
 
     async def poll_tokens(self, flow: Dict[str, Any]) -> Dict[str, Any]:
-        """Poll for access token using MSAL."""
-        def _acquire():
-            return self.app.acquire_token_by_device_flow(flow)
+        """Poll the token endpoint (RFC 8628) until the user completes sign-in."""
+        session = await self._get_session()
+        data = {
+            "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
+            "client_id": self.CLIENT_ID,
+            "device_code": flow["device_code"],
+            "client_info": "1"
+        }
 
-        result = await asyncio.get_event_loop().run_in_executor(None, _acquire)
-        if "error" in result:
-            raise Exception(result.get("error_description", "Auth failed"))
-        return result
-
-    async def authenticate_with_xbox_live(self, access_token: str) -> str:
-        """Get Xbox Live token."""
-        async with aiohttp.ClientSession() as session:
-            data = {
-                "Properties": {
-                    "AuthMethod": "RPS",
-                    "SiteName": "user.auth.xboxlive.com",
-                    "RpsTicket": f"d={access_token}"
-                },
-                "RelyingParty": "http://auth.xboxlive.com",
-                "TokenType": "JWT"
-            }
-
-            async with session.post(
-                "https://user.auth.xboxlive.com/user/authenticate",
-                json=data
-            ) as resp:
-                resp.raise_for_status()
-                result = await resp.json()
-                return result["Token"]
-
-    async def authenticate_with_xsts(self, xbox_token: str) -> str:
-        """Get XSTS token."""
-        async with aiohttp.ClientSession() as session:
-            data = {
-                "Properties": {
-                    "SandboxId": "RETAIL",
-                    "UserTokens": [xbox_token]
-                },
-                "RelyingParty": "rp://api.minecraftservices.com/",
-                "TokenType": "JWT"
-            }
-
-            async with session.post(
-                "https://xsts.auth.xboxlive.com/xsts/authorize",
-                json=data
-            ) as resp:
-                resp.raise_for_status()
+        # Never poll faster than the RFC 8628 default of 5 seconds
+        interval = max(flow.get("interval", 5), 5)
+        expires_at = flow.get("expires_at", time.time() + flow.get("expires_in", 900))
+
+        # Sleep a little longer than asked so a fast monotonic clock doesn't
+        # fire before the server's interval has elapsed
+        safety = 1.2
+        slow_downs = 0
+        start_monotonic, start_wall = time.monotonic(), time.time()
+
+        while time.time() < expires_at:
+            await asyncio.sleep(interval * safety)
+
+            async with session.post(self.TOKEN_URL, data=data) as resp:
                 result = await resp.json()
-                return result["Token"]
+
+            error = result.get("error")
+            if not error:
+                # Record the tokens in MSAL's cache so silent acquisition keeps working
+                self._msal_cache.add({
+                    "client_id": self.CLIENT_ID,
+                    "scope": self.SCOPES,
+                    "token_endpoint": self.TOKEN_URL,
+                    "response": dict(result),
+                    "data": {}
+                })
+                return result
+            if error == "authorization_pending":
+                continue
+            if error == "slow_down":
+                slow_downs += 1
+                if slow_downs > 1:
+                    drift = (time.monotonic() - start_monotonic) - (time.time() - start_wall)
+                    raise Exception(
+                        f"Token endpoint asked to slow down twice (monotonic clock drift: {drift:+.3f}s)"
+                    )
+                # RFC 8628 section 3.5: the increase applies to all later polls
+                interval += 5
+                safety = 1.4
+                continue
+            raise Exception(result.get("error_description", "Auth failed"))
+
+        raise Exception("Device code expired before sign-in completed")
+
+    async def authenticate_with_xbox_live(self, access_token: str) -> Dict[str, Any]:
+        """Get Xbox Live token response."""
+        data = {
+            "Properties": {
+                "AuthMethod": "RPS",
+                "SiteName": "user.auth.xboxlive.com",
+                "RpsTicket": f"d={access_token}"
+            },
+            "RelyingParty": "http://auth.xboxlive.com",
+            "TokenType": "JWT"
+        }
+
+        session = await self._get_session()
+        async with session.post(
+            "https://user.auth.xboxlive.com/user/authenticate",
+            json=data
+        ) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    async def authenticate_with_xsts(self, xbox_token: str) -> Dict[str, Any]:
+        """Get XSTS token response."""
+        data = {
+            "Properties": {
+                "SandboxId": "RETAIL",
+                "UserTokens": [xbox_token]
+            },
+            "RelyingParty": "rp://api.minecraftservices.com/",
+            "TokenType": "JWT"
+        }
+
+        session = await self._get_session()
+        async with session.post(
+            "https://xsts.auth.xboxlive.com/xsts/authorize",
+            json=data
+        ) as resp:
+            resp.raise_for_status()
+            return await resp.json()
 
     async def authenticate_with_minecraft(self, xsts_token: str, user_hash: str) -> Dict[str, Any]:
         """Get Minecraft access token."""
         headers = {"Authorization": f"XBL3.0 x={user_hash};{xsts_token}"}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.minecraftservices.com/authentication/login_with_xbox",
-                headers=headers
-            ) as resp:
-                resp.raise_for_status()
-                result = await resp.json()
-                return result
+        session = await self._get_session()
+        async with session.post(
+            "https://api.minecraftservices.com/authentication/login_with_xbox",
+            headers=headers
+        ) as resp:
+            resp.raise_for_status()
+            result = await resp.json()
+            return result
 
     async def get_profile(self, access_token: str) -> Dict[str, Any]:
         """Fetch Minecraft profile."""
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                "https://api.minecraftservices.com/minecraft/profile",
-                headers=headers
-            ) as resp:
-                resp.raise_for_status()
-                return await resp.json()
+        session = await self._get_session()
+        async with session.get(
+            "https://api.minecraftservices.com/minecraft/profile",
+            headers=headers
+        ) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    async def acquire_microsoft_token(self) -> str:
+        """Get a Microsoft access token, silently if possible, else via device code."""
+        # Try silent auth from the persisted MSAL cache first
+        accounts = self.app.get_accounts()
+
+        if accounts:
+            def _acquire_silent():
+                return self.app.acquire_token_silent(self.SCOPES, account=accounts[0])
+
+            silent_result = await self._run_blocking(_acquire_silent)
+            self._save_msal_cache()
+            if silent_result and "access_token" in silent_result:
+                return silent_result["access_token"]
+
+        # Device code flow
+        flow = await self.initiate_device_code_flow()
+        print(f"Go to {flow['verification_uri']}")
+        print(f"Enter code: {flow['user_code']}")
+
+        # Poll for token
+        ms_token_result = await self.poll_tokens(flow)
+        self._save_msal_cache()
+
+        # Store refresh token only if it differs from the one in the keyring
+        refresh_token = ms_token_result.get("refresh_token")
+        if refresh_token and self._refresh_token is None:
+            await self.get_stored_refresh_token()
+        if refresh_token and refresh_token != self._refresh_token:
+            await self.store_refresh_token(refresh_token)
+
+        return ms_token_result["access_token"]
 
     async def authenticate_full_flow(self) -> Dict[str, Any]:
         """Complete authentication flow, returning Minecraft profile."""
+        # Reuse the Minecraft token from this process while it is still valid
+        if time.monotonic() < self._mc_token_cache["expires_at"] - 60:
+            return self._mc_token_cache["profile"]
+
         try:
-            # Try silent auth with stored refresh token first
-            accounts = self.app.get_accounts()
-            refresh_token = self.get_stored_refresh_token()
-
-            if refresh_token and accounts:
-                def _acquire_silent():
-                    return self.app.acquire_token_silent(self.SCOPES, account=accounts[0])
-
-                silent_result = await asyncio.get_event_loop().run_in_executor(None, _acquire_silent)
-                if silent_result and "access_token" in silent_result:
-                    # Have MS token, continue with Xbox/Minecraft
-                    xbox_token = await self.authenticate_with_xbox_live(silent_result["access_token"])
-                    xsts_token = await self.authenticate_with_xsts(xbox_token)
-                    user_hash = self.extract_xbox_user_hash(xsts_token)
-                    mc_data = await self.authenticate_with_minecraft(xsts_token, user_hash)
-                    profile = await self.get_profile(mc_data["access_token"])
-                    return profile
-
-            # Device code flow
-            flow = await self.initiate_device_code_flow()
-            print(f"Go to {flow['verification_uri']}")
-            print(f"Enter code: {flow['user_code']}")
-
-            # Poll for token
-            ms_token_result = await self.poll_tokens(flow)
-
-            # Store refresh token if available
-            if "refresh_token" in ms_token_result:
-                self.store_refresh_token(ms_token_result["refresh_token"])
-
-            # Xbox auth steps
-            xbox_token = await self.authenticate_with_xbox_live(ms_token_result["access_token"])
-            xsts_token = await self.authenticate_with_xsts(xbox_token)
-            user_hash = self.extract_xbox_user_hash(xsts_token)
-
-            mc_data = await self.authenticate_with_minecraft(xsts_token, user_hash)
-            profile = await self.get_profile(mc_data["access_token"])
+            # Walk the tiers top-down, only hitting the network for expired ones;
+            # an expired tier drops every tier derived from it
+            store = self.token_store
+
+            if not store.valid("xbox"):
+                ms_access_token = await self.acquire_microsoft_token()
+                xbox_data = await self.authenticate_with_xbox_live(ms_access_token)
+                store.set("xbox", xbox_data["Token"], _parse_not_after(xbox_data["NotAfter"]))
+
+            if not store.valid("xsts"):
+                xsts_data = await self.authenticate_with_xsts(store.token("xbox"))
+                store.set("xsts", xsts_data["Token"], _parse_not_after(xsts_data["NotAfter"]))
+
+            if not store.valid("mc"):
+                xsts_token = store.token("xsts")
+                user_hash = self.extract_xbox_user_hash(xsts_token)
+                mc_data = await self.authenticate_with_minecraft(xsts_token, user_hash)
+                expires_at = datetime.now(timezone.utc) + timedelta(seconds=mc_data.get("expires_in", 0))
+                store.set("mc", mc_data["access_token"], expires_at)
+
+            store.save()
+
+            mc_access_token = store.token("mc")
+            profile = await self.get_profile(mc_access_token)
+            self._cache_minecraft_token(mc_access_token, store.expires_in("mc"), profile)
 
             return profile
 
@@ -162,11 +356,8 @@ class MicrosoftAuthenticator:
 
     def extract_xbox_user_hash(self, xsts_token: str) -> str:
         """Extract user hash from XSTS token."""
-        # XSTS token is JWT; decode to get xui[0].uhs
-        import base64
-        payload = xsts_token.split(".")[1]
+        # XSTS token is JWT; decode to get xui[0].uhs, staying in bytes throughout
+        payload = xsts_token.encode("ascii").split(b".", 2)[1]
         # Fix padding
-        payload += "=" * ((4 - len(payload) % 4) % 4)
-        decoded = base64.urlsafe_b64decode(payload)
-        data = json.loads(decoded)
-        return data["DisplayClaims"]["xui"][0]["uhs"]
+        payload += b"=" * (-len(payload) % 4)
+        return orjson.loads(base64.urlsafe_b64decode(payload))["DisplayClaims"]["xui"][0]["uhs"]
@@ -1,20 +1,27 @@
 """Offline authentication for Minecraft."""
 
+import uuid
 from typing import Dict, Any
 
 
 class OfflineAuthenticator:
     """Offline mode authenticator with username only."""
 
-    @staticmethod
-    async def authenticate(username: str) -> Dict[str, Any]:
-        """Authenticate offline with given username."""
+    @classmethod
+    def make_profile(cls, username: str) -> Dict[str, Any]:
+        """Build an offline profile for the given username."""
         if not username or len(username) > 16:
             raise ValueError("Invalid username for offline mode")
         
         return {
-            "id": username,
+            # Deterministic per username so the game sees a stable, non-empty UUID
+            "id": uuid.uuid3(uuid.NAMESPACE_OID, f"OfflinePlayer:{username}").hex,
             "name": username,
             "type": "offline",
             "access_token": ""  # No token needed
         }
+
+    @staticmethod
+    async def authenticate(username: str) -> Dict[str, Any]:
+        """Authenticate offline with given username."""
+        return OfflineAuthenticator.make_profile(username)
@@ -3,10 +3,24 @@
 import subprocess
 import platform
 import os
+from collections import ChainMap
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Mapping, Optional
 from ..versions.models import VersionMetadata, VersionLibrary
-from ..auth import MicrosoftAuthenticator
+
+
+# Platform lookups are fixed for the process lifetime
+_SYSTEM = platform.system().lower()
+_MACHINE = platform.machine().lower()
+
+# Map OS/arch to classifier keys
+_OS_DICT = {
+    "windows": "windows",
+    "linux": "linux",
+    "darwin": "macos"
+}
+_ARCH_SUFFIX = "-x86" if "64" in _MACHINE or _MACHINE in ("amd64", "x86_64") else ""
+_NATIVE_CLASSIFIER = f"{_OS_DICT.get(_SYSTEM, _SYSTEM)}{_ARCH_SUFFIX}"
 
 
 class GameLauncher:
@@ -30,24 +44,8 @@ class GameLauncher:
         if not library.natives or not library.downloads or not library.downloads.classifiers:
             return None
         
-        current_os = platform.system().lower()
-        arch = platform.machine().lower()
-        
-        # Map OS/arch to classifier keys
-        os_dict = {
-            "windows": "windows",
-            "linux": "linux",
-            "darwin": "macos"
-        }
-        
-        arch_suffix = ""
-        if "64" in arch or arch in ("amd64", "x86_64"):
-            arch_suffix = "-x86"
-        
-        classifier_key = f"{os_dict.get(current_os, current_os)}{arch_suffix}"
-        
-        if classifier_key in library.downloads.classifiers:
-            download = library.downloads.classifiers[classifier_key]
+        if _NATIVE_CLASSIFIER in library.downloads.classifiers:
+            download = library.downloads.classifiers[_NATIVE_CLASSIFIER]
             path_str = download.path
             return self.libraries_dir / path_str
         
@@ -62,22 +60,29 @@ class GameLauncher:
         if version_jar.exists():
             paths.append(str(version_jar))
         
+        # Index every file under libraries/ in one walk instead of a stat per library
+        libraries_root = str(self.libraries_dir)
+        present = set()
+        for dirpath, _, filenames in os.walk(libraries_root):
+            rel_dir = os.path.relpath(dirpath, libraries_root).replace(os.sep, "/")
+            prefix = "" if rel_dir == "." else rel_dir + "/"
+            present.update(prefix + name for name in filenames)
+        
         # Add libraries
         for lib in applicable_libs:
-            lib_path = self.get_library_path(lib)
-            if lib_path and lib_path.exists():
-                paths.append(str(lib_path))
+            if not lib.downloads or not lib.downloads.artifact:
+                continue
+            artifact_path = lib.downloads.artifact.path
+            if artifact_path in present:
+                paths.append(os.path.join(libraries_root, artifact_path))
         
         # Join with platform separator
         return os.pathsep.join(paths)
 
-    def build_jvm_args(self, metadata: VersionMetadata, user_profile: Dict, java_path: str) -> List[str]:
-        """Build JVM arguments."""
+    def build_jvm_only_args(self) -> List[str]:
+        """Build JVM arguments (no executable, classpath or game arguments)."""
         args = []
         
-        # Java executable
-        args.append(java_path)
-        
         # JVM flags
         args.extend([
             "-Xmx4G",  # Can be configurable
@@ -90,13 +95,7 @@ class GameLauncher:
             "-XX:G1HeapRegionSize=32M"
         ])
         
-        # Add classpath
-        # Note: Assuming applicable_libs is available, but passed through caller
-        
-        # Game args (user, access token, etc.)
-        game_args = self.build_game_args(metadata, user_profile)
-        
-        return args + game_args
+        return args
 
     def build_game_args(self, metadata: VersionMetadata, user_profile: Dict) -> List[str]:
         """Build game arguments."""
@@ -112,7 +111,8 @@ class GameLauncher:
         else:
             # Offline
             args.extend([
-                "--uuid", "",
+                "--uuid", user_profile.get("id", ""),
+                "--username", user_profile["name"],
                 "--demo"  # Or handle offline properly
             ])
         
@@ -138,26 +138,35 @@ class GameLauncher:
         return args
 
     def prepare_launch(self, metadata: VersionMetadata, applicable_libs: List[VersionLibrary], 
-                       user_profile: Dict, java_path: str) -> Dict:
+                       user_profile: Dict, java_path: str,
+                       env_overrides: Optional[Dict[str, str]] = None) -> Dict:
         """Prepare launch command."""
         classpath = self.assemble_classpath(metadata, applicable_libs)
         
-        jvm_args = [
+        module_args = [
             "--add-exports", "jdk.naming.dns/com.sun.jndi.dns=java.naming",
             "--add-opens", "java.base/java.util.jar=cpw.mods.securejarhandler",
             "--add-opens", "java.base/java.lang.invoke=cpw.mods.securejarhandler"
-        ] + self.build_jvm_args(metadata, user_profile, java_path)
-        
-        jvm_args.extend(["-cp", classpath])
-        jvm_args.append(metadata.mainClass)
-        
-        game_args = self.build_game_args(metadata, user_profile)
-        jvm_args.extend(game_args)
+        ]
+        
+        command = (
+            [java_path]
+            + module_args
+            + self.build_jvm_only_args()
+            + ["-cp", classpath, metadata.mainClass]
+            + self.build_game_args(metadata, user_profile)
+        )
+        
+        # None makes Popen inherit our environment; overrides are layered on top
+        # of os.environ instead of copying it
+        env: Optional[Mapping[str, str]] = None
+        if env_overrides:
+            env = ChainMap(env_overrides, os.environ)
         
         return {
-            "command": jvm_args,
+            "command": command,
             "cwd": self.minecraft_dir,
-            "env": os.environ.copy()
+            "env": env
         }
 
     def launch_game(self, launch_data: Dict) -> subprocess.Popen:
@@ -171,8 +180,9 @@ class GameLauncher:
             "stdin": subprocess.DEVNULL
         }
         
-        # Windows needs shell for console
-        if platform.system() == "Windows":
-            popen_args["shell"] = True
+        # Output is piped, so keep java.exe from opening its own console window;
+        # a CreateProcess flag rather than an intermediate cmd.exe
+        if _SYSTEM == "windows":
+            popen_args["creationflags"] = subprocess.CREATE_NO_WINDOW
         
         return subprocess.Popen(**popen_args)
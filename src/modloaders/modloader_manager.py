@@ -1,49 +1,61 @@
 """Mod loader manager."""
 
-import json
 import asyncio
+import concurrent.futures
+import os
+import zipfile
 import aiohttp
+import aiofiles
+import msgspec
+import orjson
 from pathlib import Path
 from typing import Dict, Optional, Any
 from ..versions.models import VersionMetadata
+from ..utils.async_http import get_shared_session
 
 
 class ModLoaderManager:
     def __init__(self):
         self.modloader_dir = Path.home() / ".minecraft" / "modloaders"
 
+    @staticmethod
+    async def _stream_to_file(resp: aiohttp.ClientResponse, dest: Path):
+        """Write a response body to disk without buffering it all in memory."""
+        async with aiofiles.open(dest, 'wb') as f:
+            async for chunk in resp.content.iter_chunked(64 * 1024):
+                await f.write(chunk)
+
     async def download_forge_installer(self, forge_version: str) -> Optional[Path]:
         """Download Forge installer."""
         forge_url = f"https://maven.minecraftforge.net/net/minecraftforge/forge/{forge_version}/forge-{forge_version}-installer.jar"
         dest = self.modloader_dir / "forge" / f"{forge_version}-installer.jar"
         dest.parent.mkdir(parents=True, exist_ok=True)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(forge_url) as resp:
-                if resp.status == 200:
-                    async with aiohttp.open(dest, 'wb') as f:
-                        await f.write(await resp.read())
-                    return dest
+        session = await get_shared_session()
+        async with session.get(forge_url) as resp:
+            if resp.status == 200:
+                await self._stream_to_file(resp, dest)
+                return dest
         return None
 
     async def download_fabric_installer(self, fabric_version: str) -> Optional[Path]:
         """Download Fabric installer."""
         # Find server JAR URL from meta
         meta_url = "https://meta.fabricmc.net/v2/versions/installer"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(meta_url) as resp:
-                versions = await resp.json()
-                if versions:
-                    installer_version = versions[0]['version']
-                    url = versions[0]['url']
-                    dest = self.modloader_dir / "fabric" / f"{installer_version}.jar"
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    async with session.get(url) as resp2:
-                        if resp2.status == 200:
-                            async with aiohttp.open(dest, 'wb') as f:
-                                await f.write(await resp2.read())
-                            return dest
+        session = await get_shared_session()
+        async with session.get(meta_url) as resp:
+            versions = await resp.json()
+        
+        if versions:
+            installer_version = versions[0]['version']
+            url = versions[0]['url']
+            dest = self.modloader_dir / "fabric" / f"{installer_version}.jar"
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            
+            async with session.get(url) as resp:
+                if resp.status == 200:
+                    await self._stream_to_file(resp, dest)
+                    return dest
         return None
 
     async def run_installer(self, installer_path: Path, minecraft_version: str, modloader_type: str) -> Optional[Path]:
@@ -59,8 +71,8 @@ class ModLoaderManager:
         # Modify version.json (basic example)
         base_metadata_path = Path.home() / ".minecraft" / "versions" / minecraft_version / f"{minecraft_version}.json"
         if base_metadata_path.exists():
-            with open(base_metadata_path, 'r') as f:
-                base_metadata = json.load(f)
+            async with aiofiles.open(base_metadata_path, 'rb') as f:
+                base_metadata = orjson.loads(await f.read())
             
             # Add mod loader libraries, change main class, etc.
             modded_metadata = dict(base_metadata)
@@ -84,8 +96,8 @@ class ModLoaderManager:
             modded_metadata["mainClass"] = f"net.minecraft.launchwrapper.Launch"  # Example
             
             modded_path = modded_dir / f"{minecraft_version}-{modloader_type}.json"
-            with open(modded_path, 'w') as f:
-                json.dump(modded_metadata, f, indent=2)
+            async with aiofiles.open(modded_path, 'wb') as f:
+                await f.write(orjson.dumps(modded_metadata, option=orjson.OPT_INDENT_2))
             
             return modded_path
         
@@ -100,18 +112,16 @@ class ModLoaderManager:
                 version_path = await self.run_installer(installer_path, minecraft_version, modloader_type)
                 if version_path:
                     # Load and return metadata
-                    with open(version_path, 'r') as f:
-                        data = json.load(f)
-                    return VersionMetadata(**data)
+                    async with aiofiles.open(version_path, 'rb') as f:
+                        return msgspec.json.decode(await f.read(), type=VersionMetadata)
         
         elif modloader_type.lower() == "fabric":
             installer_path = await self.download_fabric_installer(modloader_version)
             if installer_path:
                 version_path = await self.run_installer(installer_path, minecraft_version, modloader_type)
                 if version_path:
-                    with open(version_path, 'r') as f:
-                        data = json.load(f)
-                    return VersionMetadata(**data)
+                    async with aiofiles.open(version_path, 'rb') as f:
+                        return msgspec.json.decode(await f.read(), type=VersionMetadata)
         
         return None
 
@@ -119,27 +129,44 @@ class ModLoaderManager:
         """Get available versions for mod loader."""
         if modloader_type.lower() == "forge":
             url = "https://files.minecraftforge.net/net/minecraftforge/forge/"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    # Parse HTML for versions (simplified)
-                    html = await resp.text()
-                    # Extract versions from HTML
-                    return ["1.20.1-47.1.0", "1.19.4-45.1.0"]  # Example
+            session = await get_shared_session()
+            async with session.get(url) as resp:
+                # Parse HTML for versions (simplified)
+                html = await resp.text()
+                # Extract versions from HTML
+                return ["1.20.1-47.1.0", "1.19.4-45.1.0"]  # Example
         
         elif modloader_type.lower() == "fabric":
             url = "https://meta.fabricmc.net/v2/versions/loader"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    data = await resp.json()
-                    return [v['version'] for v in data]
+            session = await get_shared_session()
+            async with session.get(url) as resp:
+                data = await resp.json()
+                return [v['version'] for v in data]
         
         return []
 
     def extract_natives(self, lib_path: Path, natives_path: Path):
         """Extract native libraries (simplified)."""
         if lib_path.exists() and lib_path.suffix == ".jar":
-            import zipfile
             with zipfile.ZipFile(lib_path, 'r') as zip_ref:
-                for file_info in zip_ref.filelist:
-                    if 'META-INF' not in file_info.filename:
-                        zip_ref.extract(file_info, natives_path)
+                names = [e.filename for e in zip_ref.infolist() if 'META-INF' not in e.filename]
+
+            # Create directories up front so workers don't race on makedirs.
+            # ZipFile.extract sanitizes member names but this loop does not, so
+            # skip any parent that would land outside natives_path
+            root = natives_path.resolve()
+            for parent in {os.path.dirname(name) for name in names}:
+                target = (root / parent).resolve()
+                if os.path.commonpath([root, target]) == str(root):
+                    target.mkdir(parents=True, exist_ok=True)
+
+            # ZipFile is not thread-safe for reads, so each worker opens its own handle
+            workers = min(8, os.cpu_count() or 1)
+
+            def _extract(batch):
+                with zipfile.ZipFile(lib_path, 'r') as zf:
+                    for name in batch:
+                        zf.extract(name, natives_path)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+                list(ex.map(_extract, [names[i::workers] for i in range(workers)]))
@@ -1,32 +1,169 @@
 """Java runtime manager for Minecraft."""
 
+import asyncio
+import functools
+import io
+import json
+import os
 import platform
-import subprocess
+import queue
+import tarfile
 import zipfile
 import shutil
+import tempfile
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Tuple
 import aiohttp
 import aiofiles
 
 
+# Platform lookups are fixed for the process lifetime
+_SYSTEM = platform.system().lower()
+_MACHINE = platform.machine().lower()
+_JAVA_EXE = "java.exe" if _SYSTEM == "windows" else "java"
+# Runtime subdirectories with this prefix hold an extraction still in progress
+_STAGING_PREFIX = ".java-17-staging-"
+
+# Map to Adoptium identifiers
+_OS_MAP = {
+    "windows": "windows",
+    "linux": "linux",
+    "darwin": "mac"
+}
+_ARCH_MAP = {
+    "amd64": "x64",
+    "x86_64": "x64",
+    "i386": "x86",
+    "arm64": "aarch64"
+}
+
+
+class _ChunkStream(io.RawIOBase):
+    """Readable file object fed with chunks from the event loop.
+
+    Lets ``tarfile`` extract in a worker thread while the archive is still
+    downloading. The queue is bounded so a slow extractor holds back the
+    download instead of buffering the whole archive in memory.
+    """
+
+    _MAX_CHUNKS = 64
+
+    def __init__(self):
+        self._chunks: "queue.Queue[bytes]" = queue.Queue(maxsize=self._MAX_CHUNKS)
+        self._buffer = b""
+        self._eof = False
+
+    def _put(self, data: bytes) -> bool:
+        """Block until the reader takes ``data``; False once the reader has closed."""
+        while not self.closed:
+            try:
+                self._chunks.put(data, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    async def feed(self, data: bytes) -> bool:
+        """Queue a chunk, waiting off the event loop while the queue is full."""
+        if self.closed:
+            return False
+        try:
+            self._chunks.put_nowait(data)
+            return True
+        except queue.Full:
+            return await asyncio.get_running_loop().run_in_executor(None, self._put, data)
+
+    async def feed_eof(self):
+        await self.feed(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer and not self._eof:
+            self._buffer = self._chunks.get()
+            self._eof = not self._buffer
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def _safe_tar_members(tar: tarfile.TarFile, extract_dir: Path):
+    """Yield tar members that stay inside ``extract_dir`` (for Pythons without tar filters)."""
+    root = os.path.realpath(extract_dir)
+    for member in tar:
+        target = os.path.realpath(os.path.join(root, member.name))
+        if os.path.commonpath([root, target]) != root:
+            raise tarfile.TarError(f"Refusing to extract {member.name!r} outside {extract_dir}")
+        if (member.issym() or member.islnk()) and os.path.commonpath(
+            [root, os.path.realpath(os.path.join(os.path.dirname(target), member.linkname))]
+        ) != root:
+            raise tarfile.TarError(f"Refusing to extract link {member.name!r} outside {extract_dir}")
+        if not (member.isfile() or member.isdir() or member.issym() or member.islnk()):
+            continue
+        yield member
+
+
+@functools.lru_cache(maxsize=None)
+def _load_java_probe(probe_path: Path) -> Optional[Dict[str, Any]]:
+    """Read the persisted system Java probe, memoized for the process."""
+    try:
+        return json.loads(probe_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
 class JavaManager:
     def __init__(self, runtime_dir: Optional[Path] = None):
         self.runtime_dir = runtime_dir or (Path.home() / ".minecraft" / "runtime")
         self.runtime_dir.mkdir(parents=True, exist_ok=True)
+        self.probe_path = self.runtime_dir / ".java_probe.json"
+
+    async def probe_system_java(self) -> Optional[Tuple[Path, Optional[str]]]:
+        """Find system Java and its version, reusing the last probe while the binary is unchanged."""
+        probe = _load_java_probe(self.probe_path)
+        if probe:
+            try:
+                if Path(probe["path"]).stat().st_mtime == probe["mtime"]:
+                    return Path(probe["path"]), probe["version"]
+            except (OSError, KeyError):
+                pass
+
+        java_path = await asyncio.get_event_loop().run_in_executor(None, self._detect_system_java)
+        if not java_path:
+            return None
 
-    def get_system_java(self) -> Optional[Path]:
+        version = await self.get_java_version(java_path)
+        if version:
+            self._save_java_probe(java_path, version)
+        else:
+            self.invalidate_java_probe()
+        return java_path, version
+
+    def _save_java_probe(self, java_path: Path, version: str):
+        """Persist a system Java probe keyed by the binary's mtime."""
+        probe = {"path": str(java_path), "version": version, "mtime": java_path.stat().st_mtime}
+        self.probe_path.write_text(json.dumps(probe))
+        _load_java_probe.cache_clear()
+
+    def invalidate_java_probe(self):
+        """Forget the persisted system Java probe."""
+        if self.probe_path.exists():
+            self.probe_path.unlink()
+        _load_java_probe.cache_clear()
+
+    async def get_system_java(self) -> Optional[Path]:
         """Detect installed Java on system."""
-        try:
-            result = subprocess.run(["java", "-version"], capture_output=True, text=True)
-            if result.returncode == 0:
-                # Try to find java executable
-                result_cwd = subprocess.run(["where", "java"], capture_output=True, text=True)
-                if result_cwd.returncode == 0:
-                    java_path = Path(result_cwd.stdout.strip().split('\n')[0])
-                    return java_path.parent / "java.exe" if platform.system() == "Windows" else java_path
-        except Exception:
-            pass
+        probe = await self.probe_system_java()
+        return probe[0] if probe else None
+
+    def _detect_system_java(self) -> Optional[Path]:
+        """Search PATH and common install locations for Java."""
+        # PATH lookup without starting a JVM; the version comes from the release file
+        java_on_path = shutil.which("java")
+        if java_on_path:
+            return Path(java_on_path)
         
         # Check common paths
         common_paths = [
@@ -40,7 +177,7 @@ class JavaManager:
             if base.exists():
                 for item in base.iterdir():
                     if item.is_dir() and "java" in item.name.lower():
-                        java_bin = item / "bin" / "java.exe" if platform.system() == "Windows" else item / "bin" / "java"
+                        java_bin = item / "bin" / _JAVA_EXE
                         if java_bin.exists():
                             return java_bin
         
@@ -48,71 +185,138 @@ class JavaManager:
 
     def get_adoptium_version_url(self) -> str:
         """Get Adoptium download URL for current platform."""
-        system = platform.system().lower()
-        machine = platform.machine().lower()
-        
-        # Map to Adoptium identifiers
-        os_map = {
-            "windows": "windows",
-            "linux": "linux",
-            "darwin": "mac"
-        }
-        arch_map = {
-            "amd64": "x64",
-            "x86_64": "x64",
-            "i386": "x86",
-            "arm64": "aarch64"
-        }
-        
-        os_id = os_map.get(system, system)
-        arch_id = arch_map.get(machine, machine)
+        os_id = _OS_MAP.get(_SYSTEM, _SYSTEM)
+        arch_id = _ARCH_MAP.get(_MACHINE, _MACHINE)
         
         return f"https://api.adoptium.net/v3/binary/latest/17/ga/{os_id}/{arch_id}/jdk/hotspot/normal/adoptium"
 
     async def download_java(self, progress_callback: Optional[callable] = None) -> Optional[Path]:
         """Download and extract Adoptium JDK."""
         url = self.get_adoptium_version_url()
-        archive_name = f"java-17-adoptium-{platform.system().lower()}-{platform.machine().lower()}.zip"
-        archive_path = self.runtime_dir / archive_name
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    return None
-                
-                total_size = int(resp.headers.get('Content-Length', 0))
-                downloaded = 0
-                
-                async with aiofiles.open(archive_path, 'wb') as f:
-                    async for chunk in resp.content.iter_chunks():
-                        chunk_data = chunk[0]
-                        if not chunk[1]:
-                            continue
-                        await f.write(chunk_data)
-                        downloaded += len(chunk_data)
-                        if progress_callback:
-                            await progress_callback("java.zip", downloaded, total_size)
-        
-        # Extract
         extract_dir = self.runtime_dir / "java-17"
-        with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
+        loop = asyncio.get_event_loop()
+
+        # Extract into a staging directory and move it into place only once it
+        # is complete; a cut-off download would otherwise leave bin/java and the
+        # release file behind, and that half tree would be trusted as Java 17
+        staging_dir = Path(tempfile.mkdtemp(prefix=_STAGING_PREFIX, dir=self.runtime_dir))
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as resp:
+                    if resp.status != 200:
+                        return None
+                    
+                    total_size = int(resp.headers.get('Content-Length', 0))
+                    downloaded = 0
+                    
+                    # Adoptium only ships zips for Windows; the redirected asset URL carries no extension
+                    if _SYSTEM == "windows":
+                        # Zip needs its central directory (at the end), so spool to disk first
+                        archive_name = f"java-17-adoptium-{_SYSTEM}-{_MACHINE}.zip"
+                        archive_path = self.runtime_dir / archive_name
+                        try:
+                            async with aiofiles.open(archive_path, 'wb') as f:
+                                async for chunk in resp.content.iter_chunked(64 * 1024):
+                                    await f.write(chunk)
+                                    downloaded += len(chunk)
+                                    if progress_callback:
+                                        await progress_callback("java.zip", downloaded, total_size)
+
+                            await loop.run_in_executor(None, self._extract_zip, archive_path, staging_dir)
+                        finally:
+                            # Partial or extracted, the archive is never reused
+                            if archive_path.exists():
+                                os.unlink(archive_path)
+                    else:
+                        # Tarballs extract while the download is still streaming in
+                        stream = _ChunkStream()
+                        extraction = loop.run_in_executor(None, self._extract_tar_stream, stream, staging_dir)
+                        downloaded_ok = False
+                        try:
+                            async for chunk in resp.content.iter_chunked(64 * 1024):
+                                if not await stream.feed(chunk):
+                                    break  # extractor stopped early; its error surfaces below
+                                downloaded += len(chunk)
+                                if progress_callback:
+                                    await progress_callback("java.tar.gz", downloaded, total_size)
+                            downloaded_ok = True
+                        finally:
+                            await stream.feed_eof()
+                            if not downloaded_ok:
+                                # Retrieve the extractor's outcome so it is never left unobserved
+                                await asyncio.gather(extraction, return_exceptions=True)
+                        await extraction
+
+            await loop.run_in_executor(None, self._install_staged, staging_dir, extract_dir)
+        finally:
+            if staging_dir.exists():
+                await loop.run_in_executor(None, functools.partial(shutil.rmtree, staging_dir, ignore_errors=True))
         
         # Find java executable
         for item in extract_dir.iterdir():
             if item.is_dir():
-                java_bin = item / "bin" / ("java.exe" if platform.system() == "Windows" else "java")
+                java_bin = item / "bin" / _JAVA_EXE
                 if java_bin.exists():
                     return java_bin
         
         return None
 
-    def get_java_version(self, java_path: Path) -> Optional[str]:
+    @staticmethod
+    def _install_staged(staging_dir: Path, extract_dir: Path):
+        """Replace extract_dir with a fully extracted staging directory."""
+        if extract_dir.exists():
+            shutil.rmtree(extract_dir)
+        os.replace(staging_dir, extract_dir)
+
+    @staticmethod
+    def _extract_zip(archive_path: Path, extract_dir: Path):
+        """Extract a downloaded JDK zip."""
+        with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+            zip_ref.extractall(extract_dir)
+
+    @staticmethod
+    def _extract_tar_stream(stream: _ChunkStream, extract_dir: Path):
+        """Extract a JDK tarball as it is read from the stream."""
+        try:
+            with tarfile.open(fileobj=stream, mode="r|gz") as tar:
+                if hasattr(tarfile, "data_filter"):
+                    tar.extractall(extract_dir, filter="data")
+                else:
+                    tar.extractall(extract_dir, members=_safe_tar_members(tar, extract_dir))
+        finally:
+            # Unblocks a feeder waiting on a full queue
+            stream.close()
+
+    @staticmethod
+    def _read_release_version(java_path: Path) -> Optional[str]:
+        """Read JAVA_VERSION from the JDK's ``release`` file next to ``bin/``."""
+        try:
+            # Resolve symlinks such as /usr/bin/java -> /usr/lib/jvm/<jdk>/bin/java
+            release_path = java_path.resolve().parent.parent / "release"
+            with open(release_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    if line.startswith("JAVA_VERSION="):
+                        return line.split("=", 1)[1].strip().strip('"') or None
+        except OSError:
+            pass
+        return None
+
+    async def get_java_version(self, java_path: Path) -> Optional[str]:
         """Get Java version."""
+        # Every JDK/JRE distribution ships a release file; only start a JVM without one
+        version = self._read_release_version(java_path)
+        if version:
+            return version
+        
         try:
-            result = subprocess.run([str(java_path), "-version"], capture_output=True, text=True)
-            if result.returncode == 0:
-                version_line = result.stderr.split('\n')[0]  # version is on stderr
+            proc = await asyncio.create_subprocess_exec(
+                str(java_path), "-version",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await proc.communicate()
+            if proc.returncode == 0:
+                version_line = stderr.decode(errors="replace").split('\n')[0]  # version is on stderr
                 if "version" in version_line:
                     # Parse version
                     version_part = version_line.split('"')[1]
@@ -123,20 +327,24 @@ class JavaManager:
 
     async def ensure_java(self, progress_callback: Optional[callable] = None) -> Path:
         """Ensure Java is available, download if needed."""
-        # Try system Java first
-        system_java = self.get_system_java()
-        if system_java:
-            version = self.get_java_version(system_java)
-            if version and version.startswith("17"):
-                return system_java
-        
-        # Try downloaded Java
+        # Try downloaded Java first: globbing our own runtime dir is cheaper than
+        # searching the system, and all candidates are probed concurrently
         java_paths = list(self.runtime_dir.glob("**/bin/java")) + list(self.runtime_dir.glob("**/bin/java.exe"))
-        for java_path in java_paths:
-            version = self.get_java_version(java_path)
+        # Leftovers of an interrupted extraction are never candidates
+        java_paths = [p for p in java_paths
+                      if not p.relative_to(self.runtime_dir).parts[0].startswith(_STAGING_PREFIX)]
+        versions = await asyncio.gather(*(self.get_java_version(p) for p in java_paths))
+        for java_path, version in zip(java_paths, versions):
             if version and version.startswith("17"):
                 return java_path
         
+        # Then system Java
+        probe = await self.probe_system_java()
+        if probe:
+            system_java, version = probe
+            if version and version.startswith("17"):
+                return system_java
+        
         # Download new one
         java_path = await self.download_java(progress_callback)
         if java_path:
@@ -1,6 +1,15 @@
 """UI module for the launcher."""
 
-from .main import MainWindow
-from .auth_dialog import AuthDialog
-
 __all__ = ["MainWindow", "AuthDialog"]
+
+
+def __getattr__(name):
+    # The window pulls in aiohttp, qasync and the download stack; importing
+    # src.ui (e.g. for the baked theme) must not load them before it is shown
+    if name == "MainWindow":
+        from .main import MainWindow
+        return MainWindow
+    if name == "AuthDialog":
+        from .auth_dialog import AuthDialog
+        return AuthDialog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,51 @@
+"""Application startup shared by every launcher entry point."""
+
+import os
+import sys
+from pathlib import Path
+
+# Only Qt is needed to get a window on screen; everything else is imported later
+from PyQt6.QtWidgets import QApplication
+
+
+def main():
+    """Main launcher entry point"""
+    app = QApplication(sys.argv)
+
+    # Theme is baked into a module at build time; DEV=1 reads the on-disk file
+    # so stylesheet edits show up without re-running scripts/bake_theme.py
+    if os.environ.get("DEV") == "1":
+        theme_path = Path(__file__).resolve().parents[2] / "resources" / "themes" / "dark.qss"
+        if theme_path.exists():
+            with open(theme_path, 'r', encoding='utf-8') as f:
+                app.setStyleSheet(f.read())
+    else:
+        from ._theme_baked import QSS
+        app.setStyleSheet(QSS.decode("utf-8"))
+
+    import asyncio
+    import concurrent.futures
+    import qasync
+
+    # Downloads, aiofiles writes and to_thread() calls all share this pool;
+    # size it up front and start one worker so the first offload is not cold
+    pool_size = int(os.environ.get("MCLAUNCHER_THREAD_POOL", 32))
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="mc-io")
+    executor.submit(lambda: None).result()
+
+    # The window schedules its work on this loop, so it must exist first
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    loop.set_default_executor(executor)
+
+    from .main import MainWindow
+
+    window = MainWindow()
+    window.show()
+
+    with loop:
+        loop.run_forever()
+        # Pooled connections are released once, when the window has closed
+        from src.utils.async_http import close_shared_session
+        loop.run_until_complete(close_shared_session())
+    executor.shutdown(wait=False)
@@ -1,5 +1,6 @@
 """Authentication dialog placeholder."""
 
+from PyQt6.QtCore import pyqtSlot
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton
 
 
@@ -15,20 +16,19 @@ class AuthDialog(QDialog):
         
         layout.addWidget(QLabel("Offline Mode:"))
         self.username_input = QLineEdit()
+        self.username_input.setMaxLength(16)
         layout.addWidget(self.username_input)
         
         btn_layout = QVBoxLayout()
-        ms_btn = QPushButton("Microsoft Login")
-        btn_layout.addWidget(ms_btn)
-        
         offline_btn = QPushButton("Offline Login")
         offline_btn.clicked.connect(self.offline_auth)
         btn_layout.addWidget(offline_btn)
         
-        layout.addWidget(QVBoxLayout())  # placeholder
+        layout.addLayout(btn_layout)
         
         self.setLayout(layout)
     
+    @pyqtSlot()
     def offline_auth(self):
         self.username = self.username_input.text()
         self.accept()
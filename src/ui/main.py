@@ -1,156 +1,50 @@
 """Main UI window for the launcher."""
 
-import sys
 import asyncio
-from pathlib import Path
 from typing import Optional
-from qasync import QEventLoop, QThreadExecutor
+from qasync import asyncSlot
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
     QPushButton, QTextEdit, QProgressBar, QLabel, QSplitter, QListWidget,
     QStatusBar
 )
-from PyQt6.QtCore import QThread, pyqtSignal, Qt, QPropertyAnimation, QEasingCurve, QTimer
+from PyQt6.QtCore import pyqtSlot, Qt, QPropertyAnimation, QEasingCurve, QTimer
 from PyQt6.QtGui import QFont, QColor, QPalette
 
-
-class VersionThread(QThread):
-    """Thread for loading versions."""
-    versions_loaded = pyqtSignal(list)
-    versions_failed = pyqtSignal(str)
-
-    def run(self):
-        asyncio.run(self.load_versions_async())
-
-    async def load_versions_async(self):
-        try:
-            from src.versions import VersionManager
-            async with VersionManager() as vm:
-                manifest = await vm.fetch_manifest()
-                versions = [v.id for v in manifest.versions]
-                self.versions_loaded.emit(versions)
-        except Exception as e:
-            self.versions_failed.emit(str(e))
-
-
-class LauncherThread(QThread):
-    """Worker thread for launcher operations."""
-    auth_complete = pyqtSignal(dict)
-    auth_failed = pyqtSignal(str)
-
-    def __init__(self, auth_type: str, *args):
-        super().__init__()
-        self.auth_type = auth_type
-        self.args = args
-
-    async def run_auth(self):
-        """Run authentication in thread."""
-        try:
-            from src.auth import MicrosoftAuthenticator, OfflineAuthenticator
-
-            if self.auth_type == "microsoft":
-                auth = MicrosoftAuthenticator()
-                profile = await auth.authenticate_full_flow()
-                self.auth_complete.emit(profile)
-            elif self.auth_type == "offline":
-                username, = self.args
-                profile = await OfflineAuthenticator.authenticate(username)
-                self.auth_complete.emit(profile)
-        except Exception as e:
-            self.auth_failed.emit(str(e))
-
-    def run(self):
-        asyncio.run(self.run_auth())
-
-
-class LaunchThread(QThread):
-    """Thread for launching Minecraft."""
-    launch_started = pyqtSignal()
-    launch_progress = pyqtSignal(str, int, int)  # text, current, total
-    launch_complete = pyqtSignal()
-    launch_failed = pyqtSignal(str)
-
-    def __init__(self, version_id: str, profile: dict):
-        super().__init__()
-        self.version_id = version_id
-        self.profile = profile
-
-    async def launch_game_async(self):
-        """Launch the game asynchronously."""
-        try:
-            self.launch_started.emit()
-
-            from src.runtime import JavaManager
-            from src.versions import VersionManager, DownloadManager
-
-            # Step 1: Ensure Java
-            self.launch_progress.emit("Checking Java...", 10, 100)
-            jm = JavaManager()
-            java_path = await jm.ensure_java()
-
-            # Step 2: Get version metadata
-            self.launch_progress.emit("Fetching version metadata...", 20, 100)
-            async with VersionManager() as vm:
-                version_info = await vm.get_version_info(self.version_id)
-                metadata = await vm.fetch_version_metadata(version_info)
-
-                # Filter libraries
-                applicable_libs = await vm.filter_applicable_libraries(metadata)
-
-            # Step 3: Download dependencies
-            self.launch_progress.emit("Downloading libraries...", 30, 100)
-            async with DownloadManager() as dm:
-                lib_results = await dm.download_libraries(applicable_libs)
-                # Check for failures
-                failed_libs = [r for r in lib_results if isinstance(r, Exception)]
-                if failed_libs:
-                    self.launch_failed.emit(f"Failed to download {len(failed_libs)} libraries")
-                    return
-
-                # Download client JAR (optional for very old versions)
-                jar_success = await dm.download_version_jar(metadata)
-                # Don't fail for JAR download - some old versions might not have proper download URLs
-                # The launcher will try to find JAR locally or handle it differently
-
-                # Download assets
-                self.launch_progress.emit("Downloading assets...", 60, 100)
-                if hasattr(dm, 'download_asset_index'):
-                    asset_index = await dm.download_asset_index(metadata)
-                    if asset_index:
-                        asset_results = await dm.download_assets(asset_index)
-                        # Assets are optional, continue even if some fail
-
-            # Step 4: Launch game
-            self.launch_progress.emit("Launching Minecraft...", 80, 100)
-            from src.core import GameLauncher
-            launcher = GameLauncher()
-            launch_data = launcher.prepare_launch(metadata, applicable_libs, self.profile, str(java_path))
-
-            # Start the process
-            game_process = launcher.launch_game(launch_data)
-
-            self.launch_progress.emit("Minecraft started!", 100, 100)
-            self.launch_complete.emit()
-
-            # Monitor process (optional)
-            # In a full launcher, you'd keep this thread alive to monitor the game process
-
-        except Exception as e:
-            self.launch_failed.emit(str(e))
-
-    def run(self):
-        asyncio.run(self.launch_game_async())
+from src.auth import OfflineAuthenticator
+from src.core import GameLauncher
+from src.runtime import JavaManager
+from src.versions import VersionManager, DownloadManager, AssetCache
 
 
 class MainWindow(QMainWindow):
+    _SUCCESS_STYLE = """
+        QPushButton {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #38a169, stop:1 #2f855a);
+            border: 2px solid #38a169;
+            border-radius: 8px;
+            color: #ffffff;
+        }
+        """
+
     def __init__(self):
         super().__init__()
         self.current_profile = None
         self.version_manager = None
         self.version_manifest = None
+        # The qasync loop installed by main(); all launcher work runs on it
+        self.loop = asyncio.get_event_loop()
+
+        # Progress text is buffered and flushed at most every 50 ms
+        self._pending_console = []
+        self._pending_progress = None
+        self._console_timer = QTimer(self)
+        self._console_timer.setSingleShot(True)
+        self._console_timer.setInterval(50)
+        self._console_timer.timeout.connect(self._flush_console)
 
         self.init_ui()
-        self.init_async()
         self.load_versions()
         
     def init_ui(self):
@@ -222,33 +116,53 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status)
         self.status.showMessage("Ready")
     
-    def init_async(self):
-        """Initialize async components."""
-        self.loop = asyncio.new_event_loop()
-
-    def load_versions(self):
-        """Load Minecraft versions in background."""
+    @asyncSlot()
+    async def load_versions(self):
+        """Load Minecraft versions without blocking the UI."""
         self.status.showMessage("Loading versions...")
-        self.version_combo.clear()
-        self.version_combo.addItem("Loading versions...")
 
-        self.version_thread = VersionThread()
-        self.version_thread.versions_loaded.connect(self.on_versions_loaded)
-        self.version_thread.versions_failed.connect(self.on_versions_failed)
-        self.version_thread.start()
-    
-    def start_auth(self):
-        """Start authentication process."""
-        # Use offline auth for demo (Microsoft auth requires app registration)
-        self.auth_btn.setEnabled(False)
-        self.status.showMessage("Authenticating...")
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)  # Indeterminate
+        # Mojang lists versions latest-first, so the newest 20 are a plain slice.
+        # Show the cached list right away and refresh it from the network after
+        vm = VersionManager()
+        cached = vm.load_cached_manifest()
+        shown = None
+        if cached is not None:
+            self.version_manifest = cached
+            shown = [v.id for v in cached.versions[:20]]
+            self.on_versions_loaded(shown)
+        else:
+            self.version_combo.clear()
+            self.version_combo.addItem("Loading versions...")
 
-        self.auth_thread = LauncherThread("offline", "Player123")  # Demo username
-        self.auth_thread.auth_complete.connect(self.on_auth_success)
-        self.auth_thread.auth_failed.connect(self.on_auth_error)
-        self.auth_thread.start()
+        try:
+            async with vm:
+                manifest = await vm.fetch_manifest(cached)
+        except Exception as e:
+            if shown is None:
+                self.on_versions_failed(str(e))
+            else:
+                self.console.append(f"Could not refresh versions: {e}")
+                self.status.showMessage("Ready")
+            return
+        # Kept for launches, so they neither refetch nor lose the by_id index
+        self.version_manifest = manifest
+        versions = [v.id for v in manifest.versions[:20]]
+        if versions != shown:
+            self.on_versions_loaded(versions)
+        else:
+            self.status.showMessage("Ready")
+
+    @asyncSlot()
+    async def start_auth(self):
+        """Start authentication process."""
+        # Use offline auth for demo (Microsoft auth requires app registration).
+        # Offline profiles are built synchronously, so nothing is awaited here
+        try:
+            profile = OfflineAuthenticator.make_profile("Player123")  # Demo username
+        except ValueError as e:
+            self.on_auth_error(str(e))
+            return
+        self.on_auth_success(profile)
     
     def on_auth_success(self, profile):
         self.current_profile = profile
@@ -269,7 +183,8 @@ class MainWindow(QMainWindow):
         self.status.showMessage("Auth failed")
         self.progress_bar.setVisible(False)
     
-    def launch_game(self):
+    @asyncSlot()
+    async def launch_game(self):
         """Launch the game."""
         if not self.current_profile:
             self.console.append("Please log in first")
@@ -285,18 +200,80 @@ class MainWindow(QMainWindow):
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 100)
 
-        self.launch_thread = LaunchThread(selected_version, self.current_profile)
-        self.launch_thread.launch_started.connect(self.on_launch_started)
-        self.launch_thread.launch_progress.connect(self.on_launch_progress)
-        self.launch_thread.launch_complete.connect(self.on_launch_complete)
-        self.launch_thread.launch_failed.connect(self.on_launch_failed)
-        self.launch_thread.start()
-    
+        try:
+            self.on_launch_started()
+
+            # Step 1: Ensure Java
+            self.on_launch_progress("Checking Java...", 10, 100)
+            jm = JavaManager()
+            java_path = await jm.ensure_java()
+
+            # Step 2: Get version metadata
+            self.on_launch_progress("Fetching version metadata...", 20, 100)
+            async with VersionManager() as vm:
+                version_info = await vm.get_version_info(selected_version, self.version_manifest)
+                metadata = await vm.fetch_version_metadata(version_info)
+
+                # Filter libraries
+                applicable_libs = await vm.filter_applicable_libraries(metadata)
+
+            # Step 3: Download dependencies
+            self.on_launch_progress("Downloading libraries...", 30, 100)
+            async with DownloadManager() as dm:
+                # Libraries, client JAR and asset index only depend on the metadata,
+                # so fetch them together; the semaphores still bound open requests.
+                # Exceptions are collected so no download outlives the session
+                lib_results, jar_success, asset_index = await asyncio.gather(
+                    dm.download_libraries(applicable_libs),
+                    # Client JAR is optional for very old versions
+                    dm.download_version_jar(metadata),
+                    dm.download_asset_index(metadata),
+                    return_exceptions=True
+                )
+                for result in (lib_results, jar_success, asset_index):
+                    if isinstance(result, BaseException):
+                        raise result
+
+                # Check for failures
+                failed_libs = [r for r in lib_results if isinstance(r, Exception)]
+                if failed_libs:
+                    self.on_launch_failed(f"Failed to download {len(failed_libs)} libraries")
+                    return
+
+                # Download assets
+                self.on_launch_progress("Downloading assets...", 60, 100)
+                if asset_index:
+                    # An index whose tree hash matches the last complete install
+                    # needs no per-object work at all
+                    asset_cache = AssetCache(metadata.assets.id)
+                    if not asset_cache.is_current(asset_index):
+                        asset_results = await dm.download_assets(asset_index)
+                        # Assets are optional, continue even if some fail;
+                        # only a clean run is recorded as installed
+                        if all(r is True for r in asset_results):
+                            asset_cache.save(asset_index)
+
+            # Step 4: Launch game
+            self.on_launch_progress("Launching Minecraft...", 80, 100)
+            launcher = GameLauncher()
+            launch_data = launcher.prepare_launch(metadata, applicable_libs, self.current_profile, str(java_path))
+
+            # Start the process
+            self.game_process = launcher.launch_game(launch_data)
+
+            self.on_launch_progress("Minecraft started!", 100, 100)
+            self.on_launch_complete()
+        except Exception as e:
+            self.on_launch_failed(str(e))
+
     def on_versions_loaded(self, versions):
         """Handle loaded versions."""
+        # Keep the user's pick when a refreshed list replaces the cached one
+        selected = self.version_combo.currentText()
         self.version_combo.clear()
-        for version in sorted(versions, reverse=True)[:20]:  # Top 20 recent versions
-            self.version_combo.addItem(version)
+        self.version_combo.addItems(versions)
+        if selected in versions:
+            self.version_combo.setCurrentText(selected)
         self.status.showMessage("Ready")
 
     def on_versions_failed(self, error):
@@ -312,12 +289,28 @@ class MainWindow(QMainWindow):
 
     def on_launch_progress(self, text, current, total):
         """Handle launch progress update."""
-        self.status.showMessage(text)
-        self.progress_bar.setValue(current)
-        self.console.append(text)
+        self._pending_console.append(text)
+        self._pending_progress = current
+        if not self._console_timer.isActive():
+            self._console_timer.start()
+
+    @pyqtSlot()
+    def _flush_console(self):
+        """Write buffered progress to the console in one layout pass."""
+        self._console_timer.stop()
+        if self._pending_console:
+            self.status.showMessage(self._pending_console[-1])
+            self.console.setUpdatesEnabled(False)
+            self.console.append("\n".join(self._pending_console))
+            self.console.setUpdatesEnabled(True)
+            self._pending_console.clear()
+        if self._pending_progress is not None:
+            self.progress_bar.setValue(self._pending_progress)
+            self._pending_progress = None
 
     def on_launch_complete(self):
         """Handle launch completion."""
+        self._flush_console()
         self.console.append("Minecraft launched successfully!")
         self.status.showMessage("Minecraft Running")
         self.progress_bar.setVisible(False)
@@ -331,6 +324,7 @@ class MainWindow(QMainWindow):
 
     def on_launch_failed(self, error):
         """Handle launch failure."""
+        self._flush_console()
         self.console.append(f"Launch failed: {error}")
         self.status.showMessage("Launch Failed")
         self.progress_bar.setVisible(False)
@@ -338,21 +332,16 @@ class MainWindow(QMainWindow):
 
     def animate_button_success(self, button: QPushButton):
         """Animate button with success color flash."""
-        original_style = button.styleSheet()
-        success_style = """
-        QPushButton {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                        stop:0 #38a169, stop:1 #2f855a);
-            border: 2px solid #38a169;
-            border-radius: 8px;
-            color: #ffffff;
-        }
-        """
-
-        button.setStyleSheet(success_style)
+        # Remember the pre-flash style on the button itself, so a second flash
+        # during the first does not capture the success style as "original"
+        prev = button.property("_prev_style")
+        if prev is None:
+            prev = button.styleSheet()
+            button.setProperty("_prev_style", prev)
+        button.setStyleSheet(self._SUCCESS_STYLE)
 
         # Reset after animation
-        QTimer.singleShot(800, lambda: button.setStyleSheet(original_style))
+        QTimer.singleShot(800, lambda b=button: b.setStyleSheet(b.property("_prev_style")))
 
     def animate_status_bar_color(self, start_color: str, end_color: str):
         """Animate status bar color change (placeholder for more complex animation)."""
@@ -365,26 +354,6 @@ class MainWindow(QMainWindow):
         event.accept()
 
 
-def main():
-    """Main entry point."""
-    app = QApplication(sys.argv)
-
-    # Apply dark theme
-    theme_path = Path(__file__).parent.parent / "resources" / "themes" / "dark.qss"
-    if theme_path.exists():
-        with open(theme_path, 'r') as f:
-            app.setStyleSheet(f.read())
-
-    # Set up event loop
-    loop = QEventLoop(app)
-    asyncio.set_event_loop(loop)
-
-    window = MainWindow()
-    window.show()
-
-    with loop:
-        loop.run_forever()
-
-
 if __name__ == "__main__":
+    from src.ui.app import main
     main()
@@ -1,30 +1,45 @@
 """Auto-updater for the launcher."""
 
-import aiohttp
-import json
+import asyncio
+import ctypes
+import os
 import platform
+import shutil
 import subprocess
 from pathlib import Path
 from typing import Optional, Callable
 import aiofiles
+import orjson
+from packaging.version import InvalidVersion, Version
+
+from ..utils.async_http import get_shared_session
+
+_SYSTEM = platform.system()
+_PLATFORM_SUFFIX = {"Windows": "-windows", "Linux": "-linux", "Darwin": "-macos"}.get(_SYSTEM, "")
+_PLATFORM_KEY = {"Windows": "windows", "Linux": "linux", "Darwin": "macos"}.get(_SYSTEM)
 
 
 class AutoUpdater:
     GITHUB_API = "https://api.github.com/repos/{owner}/{repo}/releases/latest"
+    CHUNK_SIZE = 64 * 1024
+    PROGRESS_STEP = 1024 * 1024
     
     def __init__(self, owner: str = "your-github-username", repo: str = "custom-minecraft-launcher"):
         self.owner = owner
         self.repo = repo
         self.current_dir = Path(__file__).parent.parent.parent
         self.update_dir = self.current_dir / "updates"
+        self._dir_ready = False
+        # Parsed once; the running version cannot change during the process
+        self._current_version = Version(self.get_current_version())
 
     async def get_latest_release(self) -> Optional[dict]:
         """Get latest release info from GitHub."""
         url = self.GITHUB_API.format(owner=self.owner, repo=self.repo)
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+        session = await get_shared_session()
+        async with session.get(url) as resp:
+            if resp.status == 200:
+                return orjson.loads(await resp.read())
         return None
 
     def get_current_version(self) -> str:
@@ -37,44 +52,43 @@ class AutoUpdater:
 
     def should_update(self, latest_release: dict) -> bool:
         """Check if update is needed."""
-        current = self.get_current_version()
-        latest = latest_release['tag_name'].lstrip('v')
-        return latest > current
+        try:
+            latest = Version(latest_release['tag_name'].lstrip('v'))
+        except InvalidVersion:
+            return False
+        return latest > self._current_version
 
     async def download_update(self, asset_url: str, progress_callback: Optional[Callable] = None) -> Optional[Path]:
         """Download update asset."""
-        self.update_dir.mkdir(exist_ok=True)
+        if not self._dir_ready:
+            self.update_dir.mkdir(exist_ok=True)
+            self._dir_ready = True
         
-        platform_suffix = ""
-        if platform.system() == "Windows":
-            platform_suffix = "-windows"
-        elif platform.system() == "Linux":
-            platform_suffix = "-linux"
-        elif platform.system() == "Darwin":
-            platform_suffix = "-macos"
-
-        asset_name = f"launcher{platform_suffix}.exe"  # Assume .exe for Windows
+        asset_name = f"launcher{_PLATFORM_SUFFIX}.exe"  # Assume .exe for Windows
         dest = self.update_dir / asset_name
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(asset_url) as resp:
-                if resp.status != 200:
-                    return None
-                
-                total_size = int(resp.headers.get('Content-Length', 0))
-                downloaded = 0
-                
-                async with aiofiles.open(dest, 'wb') as f:
-                    async for chunk in resp.content.iter_chunks():
-                        chunk_data = chunk[0]
-                        if not chunk[1]:
-                            continue
-                        await f.write(chunk_data)
-                        downloaded += len(chunk_data)
-                        if progress_callback:
-                            await progress_callback(asset_name, downloaded, total_size)
-                
-                return dest
+        session = await get_shared_session()
+        async with session.get(asset_url) as resp:
+            if resp.status != 200:
+                return None
+            
+            total_size = int(resp.headers.get('Content-Length', 0))
+            downloaded = 0
+            last_report = 0
+            
+            async with aiofiles.open(dest, 'wb') as f:
+                # Fixed-size reads and per-MiB progress keep executor hops and
+                # callback calls proportional to size, not to network frames
+                async for data in resp.content.iter_chunked(self.CHUNK_SIZE):
+                    await f.write(data)
+                    downloaded += len(data)
+                    if progress_callback and downloaded - last_report >= self.PROGRESS_STEP:
+                        await progress_callback(asset_name, downloaded, total_size)
+                        last_report = downloaded
+            
+            if progress_callback and downloaded != last_report:
+                await progress_callback(asset_name, downloaded, total_size)
+            return dest
 
     async def install_update(self, update_path: Path) -> bool:
         """Install the update."""
@@ -82,21 +96,34 @@ class AutoUpdater:
         # In a real app, you'd replace the running exe
         target = self.current_dir / "launcher_updated.exe"  # Example
         
-        await aiofiles.copy(update_path, target)
+        await asyncio.to_thread(shutil.copy2, update_path, target)
         
         # Run update script or restart
         # This is tricky; often done with batch script
         update_script = self.update_dir / "update.bat"
-        with open(update_script, 'w') as f:
+        pid = os.getpid()
+        # Install paths and profiles are often non-ASCII; write in the ANSI code
+        # page and switch cmd.exe to it before it parses the lines with paths
+        with open(update_script, 'w', encoding='mbcs') as f:
+            # Wait for this process to exit (and release the exe) instead of a
+            # fixed sleep that is both slower and racy against AV scanners
+            # ping is the delay because timeout fails without an interactive console
             f.write(f"""
 @echo off
-timeout /t 2
+chcp {ctypes.windll.kernel32.GetACP()} >nul
+:wait
+tasklist /FI "PID eq {pid}" /NH | find "{pid}" >nul && (ping -n 2 127.0.0.1 >nul & goto wait)
 move /y "{target}" "{self.current_dir / "launcher.exe"}"
 start "" "{self.current_dir / "launcher.exe"}"
 del "%~f0"
 """)
         
-        subprocess.Popen([str(update_script)], shell=True)
+        # Launch cmd.exe directly so the script outlives this process; it gets a
+        # hidden console rather than none, which chcp needs
+        subprocess.Popen(
+            ["cmd.exe", "/c", str(update_script)],
+            creationflags=subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+        )
         return True
 
     async def check_and_update(self, progress_callback: Optional[Callable] = None) -> bool:
@@ -107,19 +134,11 @@ del "%~f0"
         
         # Find appropriate asset
         assets = release['assets']
-        asset_url = None
-        for asset in assets:
-            name = asset['name'].lower()
-            if 'windows' in name and platform.system() == "Windows":
-                asset_url = asset['browser_download_url']
-                break
-            elif 'linux' in name and platform.system() == "Linux":
-                asset_url = asset['browser_download_url']
-                break
-            # Add more checks
-        
-        if not asset_url:
-            asset_url = assets[0]['browser_download_url'] if assets else None
+        asset_url = next(
+            (a['browser_download_url'] for a in assets
+             if _PLATFORM_KEY and _PLATFORM_KEY in a['name'].lower()),
+            None
+        ) or (assets[0]['browser_download_url'] if assets else None)
         
         if not asset_url:
             return False
@@ -1,6 +1,6 @@
 """Common utilities."""
 
-from .async_http import AsyncHTTPClient
+from .async_http import AsyncHTTPClient, get_shared_session, close_shared_session
 from .logger import setup_logging
 
-__all__ = ["AsyncHTTPClient", "setup_logging"]
+__all__ = ["AsyncHTTPClient", "get_shared_session", "close_shared_session", "setup_logging"]
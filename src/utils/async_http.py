@@ -1,8 +1,33 @@
 """Async HTTP client utilities."""
 
 import aiohttp
+import orjson
 from typing import Optional, Dict, Any
 
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """Get the process-wide session, creating it on first use."""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        # Sized for bulk asset installs; the large read buffer lets each
+        # iter_chunked() call hand over up to 1 MiB at once
+        _shared_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=256, limit_per_host=64, ttl_dns_cache=600,
+                                           enable_cleanup_closed=True),
+            read_bufsize=4 * 1024 * 1024
+        )
+    return _shared_session
+
+
+async def close_shared_session():
+    """Close the process-wide session, if one was created."""
+    global _shared_session
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+
 
 class AsyncHTTPClient:
     """Reusable async HTTP client."""
@@ -11,23 +36,33 @@ class AsyncHTTPClient:
         self.default_headers = headers or {}
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(headers=self.default_headers)
         return self
     
     async def __aexit__(self, exc_type, exc, tb):
-        await self.session.close()
+        # The shared session outlives this client; see close_shared_session()
+        pass
+    
+    def _merge_headers(self, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Combine per-call headers with the defaults, copying only when both are set."""
+        if not headers:
+            return self.default_headers
+        if not self.default_headers:
+            return headers
+        return {**self.default_headers, **headers}
     
     async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """GET request."""
-        req_headers = {**self.session.headers, **(headers or {})}
-        async with self.session.get(url, headers=req_headers) as resp:
+        session = await get_shared_session()
+        req_headers = self._merge_headers(headers)
+        async with session.get(url, headers=req_headers) as resp:
             resp.raise_for_status()
-            return await resp.json()
+            return orjson.loads(await resp.read())
     
     async def post(self, url: str, json_data: Optional[Dict] = None,
                    data: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """POST request."""
-        req_headers = {**self.session.headers, **(headers or {})}
-        async with self.session.post(url, json=json_data, data=data, headers=req_headers) as resp:
+        session = await get_shared_session()
+        req_headers = self._merge_headers(headers)
+        async with session.post(url, json=json_data, data=data, headers=req_headers) as resp:
             resp.raise_for_status()
-            return await resp.json()
+            return orjson.loads(await resp.read())
@@ -1,27 +1,41 @@
 """Logging setup."""
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+_LOG_DIR = Path.home() / ".cache" / "minecraft_launcher"
+_LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+_listener = None
+
 
 def setup_logging():
     """Setup logging configuration."""
-    log_dir = Path.home() / ".cache" / "minecraft_launcher"
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
+    global _listener
+    # Repeated calls would stack another queue handler and duplicate every line
+    if _listener is not None:
+        return
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     
     # File handler
-    file_handler = logging.FileHandler(log_dir / "launcher.log")
+    file_handler = logging.FileHandler(_LOG_DIR / "launcher.log")
     file_handler.setLevel(logging.DEBUG)
     file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
     
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_formatter = logging.Formatter('%(levelname)s: %(message)s')
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    
+    # Callers only enqueue; the listener thread does the actual writes
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
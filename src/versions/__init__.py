@@ -2,6 +2,7 @@
 
 from .manager import VersionManager
 from .download_manager import DownloadManager
+from .asset_cache import AssetCache
 from .models import VersionManifest, VersionInfo
 
-__all__ = ["VersionManager", "DownloadManager", "VersionManifest", "VersionInfo"]
+__all__ = ["VersionManager", "DownloadManager", "AssetCache", "VersionManifest", "VersionInfo"]
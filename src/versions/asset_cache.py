@@ -0,0 +1,42 @@
+"""Tree hash over an asset index, used to skip re-checking installed assets."""
+
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+
+class AssetCache:
+    INDEX_DIR = Path.home() / ".minecraft" / "assets" / "indexes"
+
+    def __init__(self, index_id: str):
+        self.root_path = self.INDEX_DIR / f"{index_id}.root"
+
+    @staticmethod
+    def root_hash(asset_index: dict) -> str:
+        """Single SHA-256 over the index's sorted (hash, path) leaves."""
+        # Mojang already gives us every leaf hash, so no object has to be read.
+        # Each leaf is zero-padded to whole 64-byte blocks, so leaf boundaries
+        # are unambiguous in the concatenation
+        h = hashlib.sha256()
+        leaves = sorted((info['hash'], path) for path, info in asset_index.get('objects', {}).items())
+        for sha1, path in leaves:
+            leaf = f"{sha1}\0{path}".encode()
+            h.update(leaf.ljust(-(-len(leaf) // 64) * 64, b"\0"))
+        return h.hexdigest()
+
+    def stored_root(self) -> Optional[str]:
+        """Root recorded after the last complete install of this index."""
+        try:
+            return self.root_path.read_text().strip()
+        except OSError:
+            return None
+
+    def is_current(self, asset_index: dict) -> bool:
+        """Whether this exact asset set was already installed in full."""
+        stored = self.stored_root()
+        return stored is not None and stored == self.root_hash(asset_index)
+
+    def save(self, asset_index: dict):
+        """Record that every object in asset_index is installed."""
+        self.root_path.parent.mkdir(parents=True, exist_ok=True)
+        self.root_path.write_text(self.root_hash(asset_index))
@@ -1,72 +1,297 @@
 """Download manager for assets and libraries."""
 
 import aiohttp
-import aiofiles
 import hashlib
 import asyncio
+import logging
+import mmap
+import os
+import time
+import orjson
 from pathlib import Path
-from typing import List, Callable, Optional
+from typing import AsyncIterator, Awaitable, Iterable, List, Callable, Optional, Tuple
 from .models import VersionMetadata, VersionLibrary
+from ..utils.async_http import get_shared_session
+
+logger = logging.getLogger(__name__)
+
+# Resolved once; the asset loop would otherwise rebuild these per object
+_MC = Path.home() / ".minecraft"
+_LIBS = _MC / "libraries"
+_VERSIONS = _MC / "versions"
+_ASSET_INDEXES = _MC / "assets" / "indexes"
+_ASSETS_OBJ = _MC / "assets" / "objects"
+
+# Progress is reported at most this often, or after this many new bytes
+_PROGRESS_INTERVAL = 0.05
+_PROGRESS_BYTES = 1024 * 1024
+
+# O_BINARY keeps Windows from translating newlines in raw os.write() calls
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+_APPEND_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+
+# Files up to this size are mapped and hashed in a single update() call
+_MMAP_LIMIT = 32 * 1024 * 1024
+# Below this, one read() is cheaper than setting up a mapping
+_SMALL_FILE = 64 * 1024
+# Read size when streaming a file through the hash
+_HASH_CHUNK = 1024 * 1024
+
+
+def _file_sha1(f):
+    """SHA1 object fed with the rest of an open binary file."""
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(f, 'sha1')
+    # Python < 3.11: same loop file_digest runs, reusing one buffer
+    digest = hashlib.sha1()
+    buf = bytearray(_HASH_CHUNK)
+    view = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            return digest
+        digest.update(view[:n])
+
+
+def _digest_file(path: Path) -> str:
+    """SHA1 of a file, hashed by OpenSSL with the GIL released."""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= _SMALL_FILE:
+            return hashlib.sha1(f.read()).hexdigest()
+        if size <= _MMAP_LIMIT:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha1(mm).hexdigest()
+        return _file_sha1(f).hexdigest()
+
+
+def _hash_prefix(path: Path):
+    """SHA1 object already fed with a partial file, ready for the remaining bytes."""
+    with open(path, 'rb') as f:
+        return _file_sha1(f)
+
+
+def _sha1_matches(path: Path, expected_sha1: str) -> bool:
+    """Hash a file on a worker thread and compare it to the expected digest."""
+    try:
+        return _digest_file(path) == expected_sha1.lower()
+    except OSError:
+        return False
+
+
+def _marker_path(dest: Path) -> Path:
+    """Sidecar recording that dest matched its SHA1 when it was last written."""
+    return dest.with_name(dest.name + ".verified")
+
+
+def _write_marker(dest: Path, sha1: str):
+    """Record that dest currently matches sha1."""
+    _marker_path(dest).write_text(sha1.lower())
+
+
+def _cached(dest: Path, expected_size: Optional[int], expected_sha1: Optional[str]) -> bool:
+    """Check whether dest is already in place, hashing only when no marker vouches for it."""
+    try:
+        st = dest.stat()
+    except OSError:
+        return False
+    if expected_size is not None and st.st_size != expected_size:
+        return False
+    if not expected_sha1:
+        # Nothing to verify against; a matching size is all we can check
+        return expected_size is not None
+
+    # A marker at least as new as the file, naming the same digest, means the
+    # file has not changed since it was verified
+    marker = _marker_path(dest)
+    try:
+        if marker.stat().st_mtime >= st.st_mtime and marker.read_text() == expected_sha1.lower():
+            return True
+    except OSError:
+        pass
+    if _sha1_matches(dest, expected_sha1):
+        _write_marker(dest, expected_sha1)
+        return True
+    return False
+
+
+def _make_dirs(dirs: Iterable[Path]):
+    """Create each directory once, for a whole batch of downloads."""
+    for d in dirs:
+        d.mkdir(parents=True, exist_ok=True)
+
+
+def _drop_present(jobs: list, sizes: List[Optional[int]]) -> list:
+    """Keep only the jobs whose destination is missing or has the wrong size."""
+    kept = []
+    for job, size in zip(jobs, sizes):
+        try:
+            if size is not None and job[1].stat().st_size == size:
+                continue
+        except OSError:
+            pass
+        kept.append(job)
+    return kept
+
+
+async def _report(progress_callback: Callable, *args):
+    """Invoke a progress callback that may be either sync or async."""
+    result = progress_callback(*args)
+    if asyncio.iscoroutine(result):
+        await result
+
+
+async def _bounded(coros: Iterable[Awaitable], limit: int) -> AsyncIterator[asyncio.Future]:
+    """Run awaitables with at most limit in flight, yielding each task as it finishes."""
+    pending = set()
+    for coro in coros:
+        if len(pending) >= limit:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task
+        pending.add(asyncio.ensure_future(coro))
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield task
 
 
 class DownloadManager:
-    def __init__(self, concurrent_downloads: int = 8):
+    def __init__(self, concurrent_downloads: int = 64, assets_concurrency: int = 256):
         self.concurrent_downloads = concurrent_downloads
+        self.assets_concurrency = assets_concurrency
         self.session: Optional[aiohttp.ClientSession] = None
-        self.semaphore = asyncio.Semaphore(concurrent_downloads)
+        # Thousands of tiny library/asset objects get their own wide gate so
+        # they neither starve nor are starved by the client JAR and index
+        self.sem_bulk = asyncio.Semaphore(assets_concurrency)
+        self.sem_large = asyncio.Semaphore(concurrent_downloads)
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = await get_shared_session()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        if self.session:
-            await self.session.close()
+        # The shared session outlives this manager; see close_shared_session()
+        self.session = None
 
     async def download_file(self, url: str, dest: Path, expected_sha1: Optional[str] = None,
-                           progress_callback: Optional[Callable] = None) -> bool:
-        """Download a file with optional SHA1 verification."""
-        await self.semaphore.acquire()
+                           progress_callback: Optional[Callable] = None,
+                           sem: Optional[asyncio.Semaphore] = None,
+                           expected_size: Optional[int] = None,
+                           buffer: Optional[bytearray] = None,
+                           skip_mkdir: bool = False) -> bool:
+        """Download a file with optional SHA1 verification.
+
+        If buffer is given, the downloaded bytes are also appended to it; it is
+        left empty when the file was already present and nothing was fetched.
+        """
+        if await asyncio.to_thread(_cached, dest, expected_size, expected_sha1):
+            return True
+
+        sem = sem or self.sem_large
+        await sem.acquire()
         try:
-            async with self.session.get(url) as resp:
-                resp.raise_for_status()
-                total_size = int(resp.headers.get('Content-Length', 0))
-                downloaded = 0
-                
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                
-                async with aiofiles.open(dest, 'wb') as f:
-                    async for chunk in resp.content.iter_chunks():
-                        chunk_data = chunk[0]
-                        if not chunk[1]:  # Last chunk
-                            continue
-                        await f.write(chunk_data)
-                        downloaded += len(chunk_data)
-                        if progress_callback:
-                            await progress_callback(dest.name, downloaded, total_size)
-                
-                # Verify SHA1 if provided
-                if expected_sha1:
-                    if not await self.verify_sha1(dest, expected_sha1):
-                        return False
-                
+            # Pick up where an interrupted download left off. Captured bodies
+            # must be complete, and without a digest a stale or corrupt prefix
+            # could never be detected, so those always start from byte 0
+            start = 0
+            if buffer is None and expected_sha1:
+                try:
+                    start = (await asyncio.to_thread(dest.stat)).st_size
+                except OSError:
+                    pass
+
+            if await self._fetch(url, dest, expected_sha1, progress_callback, buffer, skip_mkdir, start):
                 return True
+            if not start:
+                return False
+            # The server refused the range (416) or the resumed file did not
+            # match its digest; the old prefix cannot be trusted, so start over
+            return await self._fetch(url, dest, expected_sha1, progress_callback, buffer, skip_mkdir, 0)
         finally:
-            self.semaphore.release()
+            sem.release()
+
+    async def _fetch(self, url: str, dest: Path, expected_sha1: Optional[str],
+                     progress_callback: Optional[Callable], buffer: Optional[bytearray],
+                     skip_mkdir: bool, start: int) -> bool:
+        """Stream url into dest, resuming at byte start when the server allows it."""
+        headers = {"Range": f"bytes={start}-"} if start else None
+        async with self.session.get(url, headers=headers) as resp:
+            if start and resp.status == 416:
+                return False
+            resp.raise_for_status()
+            # A 200 to a Range request means the server sent the whole file
+            if resp.status != 206:
+                start = 0
+            total_size = start + int(resp.headers.get('Content-Length', 0))
+            downloaded = start
+            
+            if not skip_mkdir:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Plain os.write() into the page cache is cheaper than bouncing
+            # every chunk through aiofiles' executor
+            # Hash each chunk as it is written so verification needs no re-read;
+            # a resumed download seeds the hash with the prefix already on disk
+            hash_sha1 = None
+            if expected_sha1:
+                hash_sha1 = await asyncio.to_thread(_hash_prefix, dest) if start else hashlib.sha1()
+            last_ts = time.monotonic()
+            last_bytes = downloaded
+            fd = os.open(dest, _APPEND_FLAGS if start else _WRITE_FLAGS, 0o644)
+            try:
+                async for chunk in resp.content.iter_chunked(1024 * 1024):
+                    if hash_sha1:
+                        hash_sha1.update(chunk)
+                    if buffer is not None:
+                        buffer += chunk
+                    view = memoryview(chunk)
+                    while view:
+                        view = view[os.write(fd, view):]
+                    downloaded += len(chunk)
+                    # Coalesced: one report per 50 ms or 1 MiB, not per chunk
+                    if progress_callback:
+                        now = time.monotonic()
+                        if now - last_ts >= _PROGRESS_INTERVAL or downloaded - last_bytes >= _PROGRESS_BYTES:
+                            await _report(progress_callback, dest.name, downloaded, total_size)
+                            last_ts, last_bytes = now, downloaded
+            finally:
+                os.close(fd)
+            
+            if progress_callback and downloaded != last_bytes:
+                await _report(progress_callback, dest.name, downloaded, total_size)
+            
+            # Verify SHA1 if provided
+            if hash_sha1:
+                if hash_sha1.hexdigest() != expected_sha1.lower():
+                    return False
+                await asyncio.to_thread(_write_marker, dest, expected_sha1)
+            
+            return True
 
     @staticmethod
     async def verify_sha1(file_path: Path, expected_sha1: str) -> bool:
         """Verify SHA1 hash of a file."""
-        hash_sha1 = hashlib.sha1()
-        async with aiofiles.open(file_path, 'rb') as f:
-            while chunk := await f.read(8192):
-                hash_sha1.update(chunk)
-        return hash_sha1.hexdigest() == expected_sha1.lower()
+        return await asyncio.to_thread(_sha1_matches, file_path, expected_sha1)
+
+    async def preallocate_dirs(self, dirs: Iterable[Path]):
+        """Create a batch's destination directories up front, in one worker-thread hop."""
+        await asyncio.to_thread(_make_dirs, dirs)
+
+    async def _download_and_verify(self, jobs: List[Tuple[str, Path, Optional[str], Optional[int]]]) -> list:
+        """Download (url, dest, sha1, size) jobs; digests are checked while streaming."""
+        await self.preallocate_dirs({dest.parent for _, dest, _, _ in jobs})
+        return await asyncio.gather(
+            *(self.download_file(url, dest, sha1, sem=self.sem_bulk, expected_size=size, skip_mkdir=True)
+              for url, dest, sha1, size in jobs),
+            return_exceptions=True
+        )
 
     async def download_libraries(self, applicable_libs: List[VersionLibrary],
                                 progress_callback: Optional[Callable] = None) -> List[bool]:
         """Download all libraries."""
         tasks = []
+        seen = set()
         
         for lib in applicable_libs:
             if not lib.downloads or not lib.downloads.artifact:
@@ -74,13 +299,19 @@ class DownloadManager:
             
             artifact = lib.downloads.artifact
             url = artifact.url
-            dest = Path.home() / ".minecraft" / "libraries" / artifact.path
+            dest = _LIBS / artifact.path
             sha1 = getattr(artifact, 'sha1', None)
             
-            task = self.download_file(url, dest, sha1)
-            tasks.append(task)
+            # The same artifact can be listed under several rule branches
+            key = sha1 or url
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            size = int(artifact.size) if artifact.size is not None else None
+            tasks.append((url, dest, sha1, size))
         
-        return await asyncio.gather(*tasks, return_exceptions=True)
+        return await self._download_and_verify(tasks)
 
     async def download_version_jar(self, metadata: VersionMetadata,
                                    progress_callback: Optional[Callable] = None) -> bool:
@@ -90,7 +321,7 @@ class DownloadManager:
             client_dl = downloads.client
             url = getattr(client_dl, 'url', None)
             sha1 = getattr(client_dl, 'sha1', None)
-            dest = Path.home() / ".minecraft" / "versions" / metadata.id / f"{metadata.id}.jar"
+            dest = _VERSIONS / metadata.id / f"{metadata.id}.jar"
 
             if url:
                 return await self.download_file(url, dest, sha1, progress_callback)
@@ -100,7 +331,7 @@ class DownloadManager:
         if not downloads or not downloads.client or not getattr(downloads.client, 'url', None):
             # Try old-style URL construction
             assumed_url = f"https://s3.amazonaws.com/Minecraft.Download/versions/{metadata.id}/{metadata.id}.jar"
-            dest = Path.home() / ".minecraft" / "versions" / metadata.id / f"{metadata.id}.jar"
+            dest = _VERSIONS / metadata.id / f"{metadata.id}.jar"
             # Don't fail if this doesn't work - some ancient versions may not download
             # Silently skip failed downloads for ancient versions (expected)
             try:
@@ -126,13 +357,17 @@ class DownloadManager:
         elif hasattr(assets, 'url') and hasattr(assets, 'id'):
             # Modern version with dict assets
             url = assets.url
-            dest = Path.home() / ".minecraft" / "assets" / "indexes" / f"{assets.id}.json"
+            dest = _ASSET_INDEXES / f"{assets.id}.json"
 
-            success = await self.download_file(url, dest, assets.sha1 if hasattr(assets, 'sha1') else None, progress_callback)
+            # Parse the bytes captured during the download instead of re-reading
+            # the file; only an index that was already on disk has to be read
+            body = bytearray()
+            success = await self.download_file(url, dest, assets.sha1 if hasattr(assets, 'sha1') else None,
+                                               progress_callback, buffer=body)
             if success:
-                import json
-                async with aiofiles.open(dest, 'r') as f:
-                    return json.loads(await f.read())
+                if not body:
+                    body = await asyncio.to_thread(dest.read_bytes)
+                return orjson.loads(body)
 
         return None
 
@@ -143,15 +378,37 @@ class DownloadManager:
         base_url = "https://resources.download.minecraft.net/"
         
         tasks = []
+        sizes = []
         
-        for asset_path, asset_info in objects.items():
-            hash_part = asset_info['hash']
+        # Objects are content-addressed and many virtual paths share one hash
+        unique = {info['hash']: info for info in objects.values()}
+        for hash_part, asset_info in unique.items():
             subdir = hash_part[:2]
             url = f"{base_url}{subdir}/{hash_part}"
-            dest = Path.home() / ".minecraft" / "assets" / "objects" / subdir / hash_part
+            dest = _ASSETS_OBJ / subdir / hash_part
             sha1 = asset_info['hash']
             
-            task = self.download_file(url, dest, sha1)
-            tasks.append(task)
+            size = asset_info.get('size')
+            tasks.append((url, dest, sha1, size))
+            sizes.append(size)
         
-        return await asyncio.gather(*tasks, return_exceptions=True)
+        # A content-addressed object of the right size is already in place;
+        # stat() them all in one worker thread rather than one hop per file
+        tasks = await asyncio.to_thread(_drop_present, tasks, sizes)
+        # Thousands of objects share at most 256 two-character fan-out directories
+        await self.preallocate_dirs({dest.parent for _, dest, _, _ in tasks})
+
+        # Coroutines are created lazily as slots free up, so only a bounded
+        # number of frames and buffers are alive at once. Failures are logged
+        # as they happen and kept, but never abort the rest of the batch
+        results = []
+        coros = (self.download_file(url, dest, sha1, sem=self.sem_bulk, expected_size=size, skip_mkdir=True)
+                 for url, dest, sha1, size in tasks)
+        async for task in _bounded(coros, self.assets_concurrency):
+            exc = task.exception()
+            if exc is not None:
+                logger.warning("Asset download failed: %s", exc)
+                results.append(exc)
+            else:
+                results.append(task.result())
+        return results
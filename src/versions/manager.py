@@ -1,15 +1,42 @@
 """Version manifest and metadata manager."""
 
 import aiohttp
+import asyncio
 import json
+import msgspec
+import os
+import platform
 from pathlib import Path
 from typing import Optional, Union
 from .models import VersionManifest, VersionMetadata, VersionInfo
+from ..utils.async_http import get_shared_session
+
+# Mojang's rules call macOS "osx"
+_SYSTEM = platform.system().lower()
+_CURRENT_OS = "osx" if _SYSTEM == "darwin" else _SYSTEM
+_CURRENT_ARCH = platform.machine().lower()
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Replace path in one step so readers never see a half-written file."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _load_metadata(path: Path) -> Optional[VersionMetadata]:
+    """Read a cached metadata blob; None if missing or unreadable."""
+    try:
+        return msgspec.msgpack.decode(path.read_bytes(), type=VersionMetadata)
+    except (OSError, msgspec.DecodeError):
+        return None
 
 
 class VersionManager:
     MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest.json"
     CACHE_DIR = Path.home() / ".minecraft" / "versions"
+    MANIFEST_CACHE = Path.home() / ".cache" / "minecraft_launcher" / "manifest.json"
+    MANIFEST_META = MANIFEST_CACHE.with_suffix(".meta")
 
     def __init__(self):
         self.cache_dir = self.CACHE_DIR
@@ -17,107 +44,111 @@ class VersionManager:
         self.session: Optional[aiohttp.ClientSession] = None
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = await get_shared_session()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        if self.session:
-            await self.session.close()
-
-    async def fetch_manifest(self) -> VersionManifest:
-        """Fetch the launcher version manifest."""
+        # The shared session outlives this manager; see close_shared_session()
+        self.session = None
+
+    def load_cached_manifest(self) -> Optional[VersionManifest]:
+        """Load the manifest saved by the last fetch, if any."""
+        try:
+            return msgspec.json.decode(self.MANIFEST_CACHE.read_bytes(), type=VersionManifest)
+        except (OSError, msgspec.DecodeError):
+            return None
+
+    async def fetch_manifest(self, cached: Optional[VersionManifest] = None) -> VersionManifest:
+        """Fetch the launcher version manifest.
+
+        Pass the result of load_cached_manifest() as cached if it was already
+        loaded, so the file is not read and decoded a second time.
+        """
         if not self.session:
-            self.session = aiohttp.ClientSession()
-
-        async with self.session.get(self.MANIFEST_URL) as resp:
+            self.session = await get_shared_session()
+
+        # Revalidate against the cached copy; Mojang answers 304 if unchanged.
+        # The body is gzip-compressed on the wire and decompressed by aiohttp
+        headers = {"Accept-Encoding": "gzip"}
+        if cached is None:
+            cached = self.load_cached_manifest()
+        if cached is not None:
+            try:
+                meta = json.loads(self.MANIFEST_META.read_text())
+            except (OSError, ValueError):
+                meta = {}
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        async with self.session.get(self.MANIFEST_URL, headers=headers) as resp:
+            if resp.status == 304 and cached is not None:
+                return cached
             resp.raise_for_status()
-            data = await resp.json()
-            return VersionManifest(**data)
+            body = await resp.read()
+            meta = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+
+        manifest = msgspec.json.decode(body, type=VersionManifest)
+        self.MANIFEST_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        # Body first, validators second: a crash in between leaves a fresh body
+        # with stale validators, which only costs one full re-download
+        _atomic_write(self.MANIFEST_CACHE, body)
+        _atomic_write(self.MANIFEST_META, json.dumps(meta).encode())
+        return manifest
 
     async def get_version_info(self, version_id: str, manifest: Optional[VersionManifest] = None) -> Optional[VersionInfo]:
         """Get version info for a specific version."""
         if not manifest:
             manifest = await self.fetch_manifest()
         
-        for version in manifest.versions:
-            if version.id == version_id:
-                return version
-        return None
+        return manifest.by_id.get(version_id)
 
     async def fetch_version_metadata(self, version_info: VersionInfo) -> VersionMetadata:
         """Fetch and parse version.json for a specific version."""
-        cache_path = self.cache_dir / f"{version_info.id}.json"
+        # The name carries the manifest's sha1, so a stale entry is simply a
+        # different file and a hit needs no JSON parse or validation pass
+        key = f"{version_info.id}.{version_info.sha1[:8]}" if version_info.sha1 else version_info.id
+        cache_path = self.cache_dir / f"{key}.mpk"
         
-        # Use cache if available and valid
-        if cache_path.exists():
-            with open(cache_path, 'r') as f:
-                data = json.load(f)
-                if data.get("sha1") == version_info.sha1:
-                    return VersionMetadata(**data)
+        # Use cache if available and valid; file I/O stays off the event loop
+        cached = await asyncio.to_thread(_load_metadata, cache_path)
+        if cached is not None:
+            return cached
 
         # Fetch from URL
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = await get_shared_session()
 
         async with self.session.get(version_info.url) as resp:
             resp.raise_for_status()
-            data = await resp.json()
+            body = await resp.read()
 
-        # Cache it
-        with open(cache_path, 'w') as f:
-            json.dump(data, f)
+        metadata = msgspec.json.decode(body, type=VersionMetadata)
 
-        return VersionMetadata(**data)
+        # Cache it; replaced atomically so a crash never leaves a torn blob
+        await asyncio.to_thread(_atomic_write, cache_path, msgspec.msgpack.encode(metadata))
+
+        return metadata
 
     async def filter_applicable_libraries(self, metadata: VersionMetadata) -> list:
         """Filter libraries based on rules (OS, arch, etc.)."""
-        import platform
-        import sys
-        
-        current_os = platform.system().lower()
-        if current_os == "darwin":
-            current_os = "osx"
-        current_arch = platform.machine().lower()
-        java_version = int(sys.version_info[1])  # Assume Java version matches Python minor
-        
         applicable = []
         
         for lib in metadata.libraries:
-            if not lib.rules:
-                applicable.append(lib)
-                continue
-                
             allow = True
-            for rule in lib.rules:
-                if self._matches_rule(rule, current_os, current_arch, java_version):
-                    if rule.action == "disallow":
+            for action, os_name, arch in lib._compiled_rules:
+                # Java version checks could be added here if needed
+                if (not os_name or os_name == _CURRENT_OS) and (not arch or arch in _CURRENT_ARCH):
+                    if action == "disallow":
                         allow = False
                         break
-                    elif rule.action == "allow":
+                    elif action == "allow":
                         allow = True
-                else:
-                    if rule.action == "allow":
-                        allow = False
+                elif action == "allow":
+                    allow = False
             
             if allow:
                 applicable.append(lib)
         
         return applicable
-
-    def _matches_rule(self, rule, os_name: str, arch: str, java_version: int) -> bool:
-        """Check if a rule matches current system."""
-        # rule can be dict or VersionLibraryRules object
-        if hasattr(rule, 'os') and rule.os:
-            rule_os = rule.os
-        elif isinstance(rule, dict):
-            rule_os = rule.get("os", {})
-        else:
-            return True
-
-        if hasattr(rule_os, 'name') and rule_os.name and rule_os.name != os_name:
-            return False
-        if hasattr(rule_os, 'arch') and rule_os.arch and rule_os.arch not in arch:
-            return False
-        # Add Java version check if needed
-
-        return True
@@ -1,51 +1,64 @@
-"""Data models for Minecraft versions."""
+"""Data models for Minecraft versions.
 
-from pydantic import BaseModel
-from typing import Dict, List, Optional, Any, Union
+Models are msgspec Structs so JSON is decoded and validated in a single
+pass, without an intermediate dict.
+"""
+
+import functools
+import msgspec
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
 
 
-class VersionDownloads(BaseModel):
+class VersionDownloads(msgspec.Struct):
     client: Optional[Dict[str, Any]] = None
     server: Optional[Dict[str, Any]] = None
 
 
-class VersionLibraryExtractor(BaseModel):
+class VersionLibraryExtractor(msgspec.Struct):
     exclude: Optional[List[str]] = None
 
 
-class VersionLibraryArtifact(BaseModel):
+class VersionLibraryArtifact(msgspec.Struct):
     path: Optional[str] = None
     sha1: Optional[str] = None
     size: Optional[Union[int, str]] = None
     url: Optional[str] = None
 
 
-class VersionLibraryDownloads(BaseModel):
+class VersionLibraryDownloads(msgspec.Struct):
     artifact: Optional[VersionLibraryArtifact] = None
     classifiers: Optional[Dict[str, Any]] = None
 
 
-class VersionLibraryRulesOs(BaseModel):
+class VersionLibraryRulesOs(msgspec.Struct):
     name: Optional[str] = None
     version: Optional[str] = None
     arch: Optional[str] = None
 
 
-class VersionLibraryRules(BaseModel):
+class VersionLibraryRules(msgspec.Struct):
     action: str
     os: Optional[VersionLibraryRulesOs] = None
 
 
-class VersionLibrary(BaseModel):
+# dict=True leaves room for the non-field _compiled_rules cache
+class VersionLibrary(msgspec.Struct, dict=True):
     name: str
     downloads: Optional[VersionLibraryDownloads] = None
     rules: Optional[List[VersionLibraryRules]] = None
     extract: Optional[VersionLibraryExtractor] = None
     natives: Optional[Dict[str, str]] = None
 
+    def __post_init__(self) -> None:
+        # (action, os name, arch substring) per rule, flattened once at parse time
+        self._compiled_rules: List[Tuple[str, Optional[str], Optional[str]]] = [
+            (rule.action, rule.os.name if rule.os else None, rule.os.arch if rule.os else None)
+            for rule in self.rules or ()
+        ]
+
 
-class VersionAssetsUnion(BaseModel):
+class VersionAssetsUnion(msgspec.Struct):
     id: Optional[str] = None
     sha1: Optional[str] = None
     size: Optional[int] = None
@@ -53,7 +66,7 @@ class VersionAssetsUnion(BaseModel):
     url: Optional[str] = None
 
 
-class VersionInfo(BaseModel):
+class VersionInfo(msgspec.Struct):
     id: str
     type: str
     url: str
@@ -63,12 +76,18 @@ class VersionInfo(BaseModel):
     complianceLevel: int = 0
 
 
-class VersionManifest(BaseModel):
+# dict=True gives cached_property somewhere to store the index
+class VersionManifest(msgspec.Struct, dict=True):
     latest: Dict[str, str]
     versions: List[VersionInfo]
 
+    @functools.cached_property
+    def by_id(self) -> Dict[str, VersionInfo]:
+        """Version id -> info, built on first lookup."""
+        return {v.id: v for v in self.versions}
+
 
-class VersionMetadata(BaseModel):
+class VersionMetadata(msgspec.Struct):
     """Parsed version.json data - flexible for all versions"""
     id: str
     type: Optional[str] = None
@@ -1,8 +1,19 @@
 """Tests for auth module."""
 
+import base64
+import os
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from src.auth.offline import OfflineAuthenticator
+from datetime import datetime, timedelta, timezone
+from src.auth.microsoft import MicrosoftAuthenticator, TokenStore
+
+
+@pytest.fixture(autouse=True)
+def _isolated_auth_caches(tmp_path, monkeypatch):
+    """Keep MicrosoftAuthenticator's MSAL and Xbox caches out of the real home directory."""
+    monkeypatch.setattr(MicrosoftAuthenticator, "MSAL_CACHE_PATH", tmp_path / "msal_cache.bin")
+    monkeypatch.setattr(MicrosoftAuthenticator, "XBL_CACHE_PATH", tmp_path / "xbl_cache.json")
 
 
 @pytest.mark.asyncio
@@ -13,4 +24,137 @@ async def test_offline_auth():
     assert profile["type"] == "offline"
 
 
+def test_offline_profile_has_stable_uuid():
+    """Offline profiles get a deterministic, non-empty UUID."""
+    first = OfflineAuthenticator.make_profile("testuser")
+    second = OfflineAuthenticator.make_profile("testuser")
+    assert first["id"] and first["id"] == second["id"]
+    assert first["id"] != OfflineAuthenticator.make_profile("other")["id"]
+
+
+@pytest.mark.asyncio
+async def test_microsoft_auth_reuses_cached_profile():
+    """A valid in-process Minecraft token skips the MSAL round trip."""
+    with patch("src.auth.microsoft.msal.PublicClientApplication"):
+        auth = MicrosoftAuthenticator()
+
+    profile = {"id": "abc", "name": "Steve"}
+    auth._cache_minecraft_token("token", 86400, profile)
+
+    assert await auth.authenticate_full_flow() is profile
+    auth.app.get_accounts.assert_not_called()
+
+
+def test_token_store_cascades_expiry(tmp_path):
+    """An expired Xbox token drops the XSTS and Minecraft tokens derived from it."""
+    store = TokenStore(tmp_path / "xbl_cache.json")
+    now = datetime.now(timezone.utc)
+    store.set("xbox", "xbox", now - timedelta(minutes=5))
+    store.set("xsts", "xsts", now + timedelta(hours=1))
+    store.set("mc", "mc", now + timedelta(hours=1))
+    store.save()
+
+    if os.name == "posix":
+        assert (tmp_path / "xbl_cache.json").stat().st_mode & 0o777 == 0o600
+
+    store = TokenStore(tmp_path / "xbl_cache.json")
+    assert not store.valid("xbox")
+    assert not store.valid("xsts")
+    assert not store.valid("mc")
+
+
+def _fake_session(*responses):
+    """Session whose successive POSTs return the given JSON bodies."""
+    session = MagicMock()
+    contexts = []
+    for body in responses:
+        resp = MagicMock()
+        resp.json = AsyncMock(return_value=body)
+        ctx = MagicMock()
+        ctx.__aenter__ = AsyncMock(return_value=resp)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        contexts.append(ctx)
+    session.post = MagicMock(side_effect=contexts)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_poll_tokens_backs_off_on_slow_down():
+    """slow_down permanently adds 5 seconds and widens the safety margin."""
+    with patch("src.auth.microsoft.msal.PublicClientApplication"):
+        auth = MicrosoftAuthenticator()
+    auth._msal_cache = MagicMock()
+    auth._get_session = AsyncMock(return_value=_fake_session(
+        {"error": "authorization_pending"},
+        {"error": "slow_down"},
+        {"error": "authorization_pending"},
+        {"access_token": "token"},
+    ))
+
+    with patch("src.auth.microsoft.asyncio.sleep", new=AsyncMock()) as sleep:
+        result = await auth.poll_tokens({"device_code": "code", "interval": 1, "expires_in": 900})
+
+    assert result == {"access_token": "token"}
+    assert [c.args[0] for c in sleep.await_args_list] == pytest.approx([6, 6, 14, 14])
+
+
+@pytest.mark.asyncio
+async def test_poll_tokens_aborts_on_second_slow_down():
+    """A second slow_down means the clock is unreliable, so give up."""
+    with patch("src.auth.microsoft.msal.PublicClientApplication"):
+        auth = MicrosoftAuthenticator()
+    auth._get_session = AsyncMock(return_value=_fake_session(
+        {"error": "slow_down"},
+        {"error": "slow_down"},
+    ))
+
+    with patch("src.auth.microsoft.asyncio.sleep", new=AsyncMock()):
+        with pytest.raises(Exception, match="clock drift"):
+            await auth.poll_tokens({"device_code": "code", "interval": 5, "expires_in": 900})
+
+
+def test_extract_xbox_user_hash():
+    """The user hash is read from the XSTS JWT payload."""
+    with patch("src.auth.microsoft.msal.PublicClientApplication"):
+        auth = MicrosoftAuthenticator()
+    claims = base64.urlsafe_b64encode(b'{"DisplayClaims":{"xui":[{"uhs":"1234"}]}}').rstrip(b"=")
+    token = f"header.{claims.decode()}.signature"
+
+    assert auth.extract_xbox_user_hash(token) == "1234"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_refresh_token_is_not_rewritten():
+    """The keyring is read before comparing, so an identical refresh token is not stored again."""
+    with patch("src.auth.microsoft.msal.PublicClientApplication"):
+        auth = MicrosoftAuthenticator()
+    auth._msal_cache = MagicMock(has_state_changed=False)
+    auth.app.get_accounts.return_value = []
+    auth.initiate_device_code_flow = AsyncMock(return_value={"verification_uri": "uri", "user_code": "code"})
+    auth.poll_tokens = AsyncMock(return_value={"access_token": "ms", "refresh_token": "refresh"})
+
+    with patch("src.auth.microsoft.keyring") as keyring:
+        keyring.get_password.return_value = "refresh"
+        assert await auth.acquire_microsoft_token() == "ms"
+
+    keyring.get_password.assert_called_once()
+    keyring.set_password.assert_not_called()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_msal_cache_is_owner_only(tmp_path):
+    """The MSAL cache holds a refresh token, so it is written 0600 even over an existing file."""
+    with patch("src.auth.microsoft.msal.PublicClientApplication"):
+        auth = MicrosoftAuthenticator()
+    MicrosoftAuthenticator.MSAL_CACHE_PATH.write_text("old")
+    MicrosoftAuthenticator.MSAL_CACHE_PATH.chmod(0o644)
+    auth._msal_cache = MagicMock(has_state_changed=True)
+    auth._msal_cache.serialize.return_value = "{}"
+
+    auth._save_msal_cache()
+
+    assert MicrosoftAuthenticator.MSAL_CACHE_PATH.read_text() == "{}"
+    assert MicrosoftAuthenticator.MSAL_CACHE_PATH.stat().st_mode & 0o777 == 0o600
+
+
 # Add more tests for Microsoft auth (with mocks)
@@ -0,0 +1,230 @@
+"""Tests for the version download path."""
+
+import asyncio
+import hashlib
+import os
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from unittest.mock import patch
+from src.versions import AssetCache, DownloadManager, VersionManager
+from src.versions import download_manager
+
+PAYLOAD = bytes(range(256)) * 4096
+PAYLOAD_SHA1 = hashlib.sha1(PAYLOAD).hexdigest()
+
+
+class _FileServer:
+    """Local server for PAYLOAD whose Range handling is chosen per test."""
+
+    def __init__(self, range_mode: str = "honor", body: bytes = PAYLOAD):
+        self.range_mode = range_mode  # "honor", "ignore" or "refuse"
+        self.body = body
+        self.ranges = []
+        app = web.Application()
+        app.router.add_get("/file", self.handle)
+        self.server = TestServer(app)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        header = request.headers.get("Range")
+        self.ranges.append(header)
+        if header and self.range_mode == "refuse":
+            return web.Response(status=416)
+        if header and self.range_mode == "honor":
+            start = int(header[len("bytes="):].rstrip("-"))
+            return web.Response(status=206, body=self.body[start:])
+        return web.Response(body=self.body)
+
+    async def __aenter__(self):
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.server.close()
+
+    @property
+    def url(self) -> str:
+        return str(self.server.make_url("/file"))
+
+
+async def _download(server: _FileServer, dest, sha1=PAYLOAD_SHA1) -> bool:
+    manager = DownloadManager()
+    async with aiohttp.ClientSession() as manager.session:
+        return await manager.download_file(server.url, dest, sha1, expected_size=len(PAYLOAD))
+
+
+@pytest.mark.asyncio
+async def test_resume_appends_to_partial_file(tmp_path):
+    """A partial file is completed with a Range request, not re-downloaded."""
+    dest = tmp_path / "file.bin"
+    dest.write_bytes(PAYLOAD[:1000])
+
+    async with _FileServer("honor") as server:
+        assert await _download(server, dest)
+
+    assert server.ranges == ["bytes=1000-"]
+    assert dest.read_bytes() == PAYLOAD
+    assert (tmp_path / "file.bin.verified").read_text() == PAYLOAD_SHA1
+
+
+@pytest.mark.asyncio
+async def test_resume_when_server_ignores_range(tmp_path):
+    """A 200 answer to a Range request replaces the partial file instead of appending."""
+    dest = tmp_path / "file.bin"
+    dest.write_bytes(PAYLOAD[:1000])
+
+    async with _FileServer("ignore") as server:
+        assert await _download(server, dest)
+
+    assert server.ranges == ["bytes=1000-"]
+    assert dest.read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_resume_refused_restarts_from_zero(tmp_path):
+    """A 416 answer falls back to a full download."""
+    dest = tmp_path / "file.bin"
+    dest.write_bytes(PAYLOAD[:1000])
+
+    async with _FileServer("refuse") as server:
+        assert await _download(server, dest)
+
+    assert server.ranges == ["bytes=1000-", None]
+    assert dest.read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_corrupt_prefix_is_downloaded_again(tmp_path):
+    """A resumed file that fails its digest is fetched again from byte 0."""
+    dest = tmp_path / "file.bin"
+    dest.write_bytes(b"\xff" * 1000)
+
+    async with _FileServer("honor") as server:
+        assert await _download(server, dest)
+
+    assert server.ranges == ["bytes=1000-", None]
+    assert dest.read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_no_resume_without_digest(tmp_path):
+    """Without a SHA1 a leftover file cannot be checked, so it is replaced, not extended."""
+    dest = tmp_path / "file.bin"
+    dest.write_bytes(b"stale")
+
+    async with _FileServer("honor") as server:
+        assert await _download(server, dest, sha1=None)
+
+    assert server.ranges == [None]
+    assert dest.read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_digest_mismatch_fails_without_marker(tmp_path):
+    """A fresh download with the wrong content is reported and never marked verified."""
+    dest = tmp_path / "file.bin"
+    bad = b"\x00" * len(PAYLOAD)
+
+    async with _FileServer("honor", body=bad) as server:
+        assert not await _download(server, dest)
+
+    assert server.ranges == [None]
+    assert not (tmp_path / "file.bin.verified").exists()
+
+
+def test_verified_marker_skips_rehash(tmp_path):
+    """Once verified, an unchanged file is trusted without hashing it again."""
+    dest = tmp_path / "file.bin"
+    dest.write_bytes(PAYLOAD)
+
+    assert download_manager._cached(dest, len(PAYLOAD), PAYLOAD_SHA1)
+    assert (tmp_path / "file.bin.verified").read_text() == PAYLOAD_SHA1
+
+    with patch.object(download_manager, "_sha1_matches") as sha1_matches:
+        assert download_manager._cached(dest, len(PAYLOAD), PAYLOAD_SHA1)
+    sha1_matches.assert_not_called()
+
+
+def test_verified_marker_ignored_after_file_changes(tmp_path):
+    """A file modified after its marker was written is hashed again."""
+    dest = tmp_path / "file.bin"
+    dest.write_bytes(PAYLOAD)
+    assert download_manager._cached(dest, len(PAYLOAD), PAYLOAD_SHA1)
+
+    dest.write_bytes(b"\x00" * len(PAYLOAD))
+    marker_mtime = (tmp_path / "file.bin.verified").stat().st_mtime
+    os.utime(dest, (marker_mtime + 10, marker_mtime + 10))
+
+    assert not download_manager._cached(dest, len(PAYLOAD), PAYLOAD_SHA1)
+    assert not download_manager._cached(dest, len(PAYLOAD) + 1, PAYLOAD_SHA1)
+
+
+@pytest.mark.asyncio
+async def test_bounded_limits_in_flight_tasks():
+    """_bounded never runs more than limit awaitables and yields every one."""
+    running = 0
+    peak = 0
+
+    async def job(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001 * (i % 3))
+        running -= 1
+        return i
+
+    results = [task.result() async for task in download_manager._bounded((job(i) for i in range(20)), 4)]
+
+    assert sorted(results) == list(range(20))
+    assert peak == 4
+
+
+def test_asset_cache_tracks_index_contents(tmp_path, monkeypatch):
+    """The stored root matches only the exact set of objects it was saved for."""
+    monkeypatch.setattr(AssetCache, "INDEX_DIR", tmp_path)
+    index = {"objects": {"a.ogg": {"hash": "1" * 40}, "b.ogg": {"hash": "2" * 40}}}
+    reordered = {"objects": dict(reversed(list(index["objects"].items())))}
+    changed = {"objects": {**index["objects"], "c.ogg": {"hash": "3" * 40}}}
+    cache = AssetCache("17")
+
+    assert not cache.is_current(index)
+    cache.save(index)
+    assert cache.is_current(index)
+    assert cache.is_current(reordered)
+    assert not cache.is_current(changed)
+
+
+MANIFEST = b'{"latest": {"release": "1.20.1"}, "versions": [{"id": "1.20.1", "type": "release", ' \
+           b'"url": "https://example.invalid/1.20.1.json", "time": "2023-06-12T13:25:51+00:00", ' \
+           b'"releaseTime": "2023-06-12T13:25:51+00:00"}]}'
+
+
+@pytest.mark.asyncio
+async def test_manifest_revalidates_with_etag(tmp_path, monkeypatch):
+    """A second fetch sends the stored ETag and returns the already-loaded manifest on 304."""
+    monkeypatch.setattr(VersionManager, "CACHE_DIR", tmp_path / "versions")
+    monkeypatch.setattr(VersionManager, "MANIFEST_CACHE", tmp_path / "manifest.json")
+    monkeypatch.setattr(VersionManager, "MANIFEST_META", tmp_path / "manifest.meta")
+    seen = []
+
+    async def handle(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=MANIFEST, headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/manifest.json", handle)
+    async with TestServer(app) as server:
+        monkeypatch.setattr(VersionManager, "MANIFEST_URL", str(server.make_url("/manifest.json")))
+        manager = VersionManager()
+        async with aiohttp.ClientSession() as manager.session:
+            first = await manager.fetch_manifest()
+            with patch.object(VersionManager, "load_cached_manifest") as load_cached:
+                second = await manager.fetch_manifest(first)
+
+    load_cached.assert_not_called()
+    assert seen == [None, '"v1"']
+    assert first.by_id["1.20.1"].type == "release"
+    assert second is first